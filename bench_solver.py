@@ -0,0 +1,62 @@
+import argparse
+import time
+
+from engine import DIFFICULTIES, MinesweeperEngine
+from probability import mine_probabilities
+from solver import solve
+
+
+#Plays one game from a first click in the middle using only certain moves.
+#Returns the engine and the snapshot of every position the solver was asked about
+def play(difficulty, seed):
+    engine = MinesweeperEngine.from_difficulty(difficulty, seed, lazy=True)
+    engine.reveal(engine.rows // 2, engine.cols // 2)
+    positions = []
+    while not engine.finished:
+        positions.append(engine.snapshot())
+        safe, mines = solve(engine)
+        if not safe and not mines: #stuck, a guess would be needed
+            break
+        for r, c in mines:
+            if not engine.is_flagged(r, c):
+                engine.toggle_flag(r, c)
+        for r, c in safe:
+            engine.reveal(r, c)
+    return engine, positions
+
+
+#Times function(engine) alone over recorded positions, replayed into one engine
+def time_positions(difficulty, positions, function=solve):
+    engine = MinesweeperEngine.from_difficulty(difficulty, lazy=True)
+    start = time.perf_counter()
+    for position in positions:
+        engine.restore(position)
+        function(engine)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the solver and mine probabilities on the level presets")
+    parser.add_argument("--games", type=int, default=500, help="games per preset")
+    args = parser.parse_args()
+
+    print(f"{'level':<10}{'board':>10}{'no-guess wins':>16}{'positions':>11}{'ms/solve':>10}{'solves/s':>10}"
+          f"{'games/s':>9}{'ms/prob':>9}")
+    for difficulty, (rows, cols, mines) in DIFFICULTIES.items():
+        start = time.perf_counter()
+        wins = 0
+        positions = []
+        stuck = [] #where a guess is needed, what mine_probabilities is for
+        for seed in range(args.games):
+            engine, seen = play(difficulty, seed)
+            wins += engine.win
+            positions.extend(seen)
+            if not engine.finished:
+                stuck.append(seen[-1])
+        games_per_second = args.games / (time.perf_counter() - start)
+
+        elapsed = time_positions(difficulty, positions)
+        exact = time_positions(difficulty, stuck, mine_probabilities) / max(1, len(stuck))
+        print(f"{difficulty:<10}{f'{rows}x{cols}/{mines}':>10}{wins / args.games:>15.1%} {len(positions):>11}"
+              f"{elapsed / len(positions) * 1000:>10.3f}{len(positions) / elapsed:>10.0f}{games_per_second:>9.0f}"
+              f"{exact * 1000:>9.2f}")
@@ -0,0 +1,165 @@
+from engine import MINE, MinesweeperEngine, iter_bits, sample_mines
+
+
+#Same rules as MinesweeperEngine, every layer kept as one Python int.
+#Bit r*stride + c is cell (r, c); stride is cols + 1 so each row ends in an
+#always-zero padding bit and horizontal shifts never wrap into the next row.
+#Neighbor counts are 4 bit-planes (count = c0 + 2*c1 + 4*c2 + 8*c3) built
+#by adding the 8 shifted mine layers with a bit-sliced ripple-carry adder
+class BitboardEngine(MinesweeperEngine):
+    def init_board(self):
+        self.stride = self.cols + 1
+        row = (1 << self.cols) - 1
+        self.full = 0
+        for r in range(self.rows):
+            self.full |= row << (r * self.stride)
+
+        self.mine_bits = 0
+        self.revealed_bits = 0
+        self.flagged_bits = 0
+        self.count_planes = [0, 0, 0, 0]
+
+    def board_snapshot(self):
+        return self.mine_bits, self.revealed_bits, self.flagged_bits, tuple(self.count_planes)
+
+    def restore_board(self, board):
+        self.mine_bits, self.revealed_bits, self.flagged_bits, planes = board
+        self.count_planes = list(planes)
+
+    def bit(self, r, c):
+        return 1 << (r * self.stride + c)
+
+    def cell(self, b):
+        return divmod(b, self.stride)
+
+    #the 8 neighbor shifts of a layer, clipped to the board
+    def shifted(self, x):
+        full, s = self.full, self.stride
+        return (
+            (x << 1) & full, x >> 1,
+            (x << s) & full, x >> s,
+            (x << (s + 1)) & full, (x >> (s + 1)) & full,
+            (x << (s - 1)) & full, (x >> (s - 1)) & full,
+            )
+
+    #3x3 dilation, used to grow flood regions
+    def dilate(self, x):
+        grown = x
+        for layer in self.shifted(x):
+            grown |= layer
+        return grown & self.full
+
+    def add_to_planes(self, x):
+        planes = self.count_planes
+        for k in range(4):
+            if not x:
+                break
+            planes[k], x = planes[k] ^ x, planes[k] & x
+
+    def sub_from_planes(self, x):
+        planes = self.count_planes
+        for k in range(4):
+            if not x:
+                break
+            planes[k], x = planes[k] ^ x, ~planes[k] & x
+
+    #cell accessors
+    def is_mine(self, r, c):
+        return bool(self.mine_bits >> (r * self.stride + c) & 1)
+
+    def value(self, r, c):
+        b = r * self.stride + c
+        if self.mine_bits >> b & 1:
+            return MINE
+        return sum((plane >> b & 1) << k for k, plane in enumerate(self.count_planes))
+
+    def is_revealed(self, r, c):
+        return bool(self.revealed_bits >> (r * self.stride + c) & 1)
+
+    def is_flagged(self, r, c):
+        return bool(self.flagged_bits >> (r * self.stride + c) & 1)
+
+    def set_flag(self, r, c, flagged):
+        if flagged:
+            self.flagged_bits |= self.bit(r, c)
+        else:
+            self.flagged_bits &= ~self.bit(r, c)
+
+    #mines are set in a bytearray first, then turned into one int
+    def place_mines(self, exclude=()):
+        cols, stride = self.cols, self.stride
+        skipped = [r * cols + c for r, c in exclude]
+        bitmap = bytearray((self.rows * stride + 7) // 8)
+        for i in sample_mines(self.rows * cols, self.mines, skipped, self.random):
+            r, c = divmod(i, cols)
+            b = r * stride + c
+            bitmap[b >> 3] |= 1 << (b & 7)
+        self.mine_bits = int.from_bytes(bitmap, "little")
+
+    def calculate_numbers(self):
+        self.count_planes = [0, 0, 0, 0]
+        for layer in self.shifted(self.mine_bits):
+            self.add_to_planes(layer)
+
+    def zero_bits(self): #safe cells with no mine around
+        c0, c1, c2, c3 = self.count_planes
+        return self.full & ~self.mine_bits & ~(c0 | c1 | c2 | c3)
+
+    #Word-parallel fill: grow from (r, c) over hidden, unflagged cells,
+    #expanding only from zero cells, until the region stops changing
+    def flood_fill(self, r, c):
+        if not self.in_bounds(r, c):
+            return []
+        seed = self.bit(r, c)
+        if (self.revealed_bits | self.flagged_bits) & seed:
+            return []
+
+        allowed = self.full & ~self.revealed_bits & ~self.flagged_bits
+        zeros = self.zero_bits()
+        region = seed
+        while True:
+            grown = region | (self.dilate(region & zeros) & allowed)
+            if grown == region:
+                break
+            region = grown
+
+        self.revealed_bits |= region
+        self.safe_left -= region.bit_count()
+        return [self.cell(b) for b in iter_bits(region)]
+
+    def reveal_all_mines(self):
+        self.revealed_bits |= self.mine_bits
+
+    def check_win(self):
+        if (self.revealed_bits | self.mine_bits) == self.full and not self.game_over:
+            self.win = True
+        return self.win
+
+    #incremental edits add or subtract the 3x3 ring of the cell from the planes
+    def add_mine(self, r, c):
+        self.start_edit()
+        b = self.bit(r, c)
+        if self.mine_bits & b:
+            return False
+        if self.revealed_bits & b:
+            raise ValueError(f"cannot put a mine on revealed cell {(r, c)}")
+        self.check_mine_limit()
+
+        self.mine_bits |= b
+        self.add_to_planes(self.dilate(b) & ~b)
+        self.mines += 1
+        self.safe_left -= 1
+        return True
+
+    def remove_mine(self, r, c):
+        self.start_edit()
+        b = self.bit(r, c)
+        if not self.mine_bits & b:
+            return False
+
+        self.mine_bits &= ~b
+        self.sub_from_planes(self.dilate(b) & ~b)
+        self.mines -= 1
+        if not self.revealed_bits & b:
+            self.safe_left += 1
+        return True
@@ -0,0 +1,70 @@
+import math
+
+#Cell sizes in pixels the view can zoom through. Sizes below 1 put several
+#cells in one pixel, for whole-board overviews
+ZOOM_LEVELS = (0.125, 0.25, 0.5, 1, 2, 3, 4, 6, 8, 12, 16, 20, 24, 30, 40)
+
+
+#Maps between the window and the board. (x, y) is the board pixel at the
+#top-left of the view at the current zoom, so a cell's on-screen position is
+#its board position minus (x, y). Only cells inside the view get drawn
+class Camera:
+    def __init__(self, rows, cols, view_width, view_height, cell_size, min_cell_size=2):
+        self.rows = rows
+        self.cols = cols
+        self.view_width = view_width
+        self.view_height = view_height
+        self.cell_size = cell_size
+        self.levels = [size for size in ZOOM_LEVELS if size >= min_cell_size]
+        self.x = 0
+        self.y = 0
+
+    def clamp(self):
+        cs = self.cell_size
+        self.x = max(0, min(self.x, int(self.cols * cs) - self.view_width))
+        self.y = max(0, min(self.y, int(self.rows * cs) - self.view_height))
+
+    #Returns True when the view actually moved
+    def pan(self, dx, dy):
+        old = (self.x, self.y)
+        self.x += dx
+        self.y += dy
+        self.clamp()
+        return (self.x, self.y) != old
+
+    #Step through ZOOM_LEVELS keeping the board point under (ax, ay) in place
+    def zoom(self, steps, ax, ay):
+        levels = self.levels
+        current = min(range(len(levels)), key=lambda k: abs(levels[k] - self.cell_size))
+        new_size = levels[max(0, min(len(levels) - 1, current + steps))]
+        if new_size == self.cell_size:
+            return False
+
+        scale = new_size / self.cell_size
+        self.x = int((self.x + ax) * scale) - ax
+        self.y = int((self.y + ay) * scale) - ay
+        self.cell_size = new_size
+        self.clamp()
+        return True
+
+    def cell_at(self, x, y):
+        r = int((self.y + y) // self.cell_size)
+        c = int((self.x + x) // self.cell_size)
+        if 0 <= r < self.rows and 0 <= c < self.cols:
+            return r, c
+        return None
+
+    #Half-open (r0, r1, c0, c1) range of the cells that touch the view
+    def visible_cells(self):
+        cs = self.cell_size
+        r0, c0 = int(self.y // cs), int(self.x // cs)
+        r1 = min(self.rows, math.ceil((self.y + self.view_height) / cs))
+        c1 = min(self.cols, math.ceil((self.x + self.view_width) / cs))
+        return r0, r1, c0, c1
+
+    def is_visible(self, r, c):
+        r0, r1, c0, c1 = self.visible_cells()
+        return r0 <= r < r1 and c0 <= c < c1
+
+    def cell_origin(self, r, c):
+        return c * self.cell_size - self.x, r * self.cell_size - self.y
@@ -0,0 +1,83 @@
+import argparse
+import random
+import sys
+from itertools import combinations
+
+from engine import MinesweeperEngine
+from probability import mine_probabilities
+
+#Positions with more unknown cells than this are skipped, the brute force
+#tries every way to place the mines on them
+MAX_UNKNOWN = 22
+
+
+#A small board a few random safe clicks into a game, with up to one correct
+#flag. Returns None when the game ended on the way
+def random_position(rng, seed):
+    rows, cols = rng.choice([(5, 5), (6, 6), (4, 7)])
+    engine = MinesweeperEngine(rows, cols, rng.randrange(3, 8), seed, lazy=True)
+    engine.reveal(rng.randrange(rows), rng.randrange(cols))
+    for _ in range(rng.randrange(4)):
+        safe = [(r, c) for r in range(rows) for c in range(cols)
+                if not engine.is_revealed(r, c) and not engine.is_mine(r, c)]
+        if engine.finished or not safe:
+            break
+        engine.reveal(*rng.choice(safe))
+    if engine.finished:
+        return None
+
+    mines = [(r, c) for r in range(rows) for c in range(cols) if engine.is_mine(r, c)]
+    for r, c in rng.sample(mines, rng.randrange(2)):
+        engine.toggle_flag(r, c)
+    return engine
+
+
+#{(r, c): probability} by enumerating every mine layout that fits what the
+#player sees, or None when there are too many unknown cells
+def brute_force(engine, trust_flags):
+    rows, cols = engine.rows, engine.cols
+    flags = {(r, c) for r in range(rows) for c in range(cols) if trust_flags and engine.is_flagged(r, c)}
+    unknown = [(r, c) for r in range(rows) for c in range(cols)
+               if not engine.is_revealed(r, c) and (r, c) not in flags]
+    if len(unknown) > MAX_UNKNOWN:
+        return None
+    numbers = [(r, c, engine.value(r, c)) for r in range(rows) for c in range(cols) if engine.is_revealed(r, c)]
+
+    counts = dict.fromkeys(unknown, 0)
+    layouts = 0
+    for placed in combinations(unknown, engine.mines - len(flags)):
+        mines = flags.union(placed)
+        if all(sum(cell in mines for cell in engine.neighbors(r, c)) == value for r, c, value in numbers):
+            layouts += 1
+            for cell in placed:
+                counts[cell] += 1
+    return {cell: count / layouts for cell, count in counts.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare mine_probabilities with brute-force enumeration on small boards")
+    parser.add_argument("--positions", type=int, default=400, help="random positions to try")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    checked = 0
+    worst = 0.0
+    for seed in range(args.positions):
+        engine = random_position(rng, seed)
+        if engine is None:
+            continue
+        trust_flags = rng.random() < 0.5
+        expected = brute_force(engine, trust_flags)
+        if expected is None:
+            continue
+
+        exact = mine_probabilities(engine, trust_flags)
+        if set(exact) != set(expected):
+            sys.exit(f"seed {seed}: cells differ {sorted(set(exact) ^ set(expected))}")
+        error = max(abs(exact[cell] - p) for cell, p in expected.items())
+        if error > 1e-9:
+            sys.exit(f"seed {seed}: probabilities off by {error}")
+        worst = max(worst, error)
+        checked += 1
+    print(f"{checked} positions match brute force (worst difference {worst:.2g})")
@@ -0,0 +1,22 @@
+#Display Setting
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+GRAY = (192, 192, 192)
+DARK_GRAY = (128, 128, 128)
+LIGHT_GRAY = (220, 220, 220)
+GREEN = (0, 200, 0)
+ORANGE = (255, 140, 0)
+
+#Number Colors
+NUMBER_COLORS = {
+    1: (0, 0, 255),
+    2: (0, 128, 0),
+    3: (255, 0, 0),
+    4: (0, 0, 128),
+    5: (128, 0, 0),
+    6: (0, 128, 128),
+    7: (0, 0, 0),
+    8: (128, 128, 128)
+    }
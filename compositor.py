@@ -0,0 +1,67 @@
+import numpy as np
+import pygame
+
+from tiles import TILE_EXPLODED, TILE_OF_CELL
+
+TILE_LUT = np.frombuffer(TILE_OF_CELL, dtype=np.uint8) #cell byte -> tile id
+
+#Above this cell size the per-cell blits are already cheap
+COMPOSITE_MAX_CELL = 8
+
+
+#Builds the visible part of the board as one RGB array and pushes it with a
+#single surfarray.blit_array (needs numpy). Cells of 2px and up are gathered
+#from the tile atlas; smaller cells sample one colour per pixel from a table
+#of average tile colours. surfarray arrays are indexed [x, y]
+class SurfarrayCompositor:
+    def __init__(self, base_tiles):
+        self.colors = np.array(
+            [pygame.surfarray.array3d(tile).reshape(-1, 3).mean(axis=0) for tile in base_tiles],
+            dtype=np.uint8)
+        self.atlases = {} #cell size -> (tiles, size, size, 3) pixel array
+
+    def atlas(self, tiles, cell_size):
+        pixels = self.atlases.get(cell_size)
+        if pixels is None:
+            pixels = np.stack([pygame.surfarray.array3d(tile) for tile in tiles])
+            self.atlases[cell_size] = pixels
+        return pixels
+
+    def render(self, surface, engine, camera, tiles, background):
+        board = np.frombuffer(engine.cells, dtype=np.uint8).reshape(engine.rows, engine.cols)
+        width, height = surface.get_size()
+        frame = np.empty((width, height, 3), dtype=np.uint8)
+        frame[:] = background
+
+        if camera.cell_size >= 2:
+            image = self.gather(board, engine.exploded, camera, tiles)
+        else:
+            image = self.sample(board, camera)
+        image = image[:width, :height]
+        frame[:image.shape[0], :image.shape[1]] = image
+        pygame.surfarray.blit_array(surface, frame)
+
+    #one atlas tile per visible cell, cropped to the camera's pixel offset
+    def gather(self, board, exploded, camera, tiles):
+        cs = camera.cell_size
+        r0, r1, c0, c1 = camera.visible_cells()
+        ids = TILE_LUT[board[r0:r1, c0:c1]]
+        if exploded is not None:
+            er, ec = exploded
+            if r0 <= er < r1 and c0 <= ec < c1:
+                ids[er - r0, ec - c0] = TILE_EXPLODED
+
+        blocks = self.atlas(tiles, cs)[ids] #[r, c, x, y, rgb]
+        image = blocks.transpose(1, 2, 0, 3, 4).reshape((c1 - c0) * cs, (r1 - r0) * cs, 3)
+        ox, oy = camera.x - c0 * cs, camera.y - r0 * cs
+        return image[ox:ox + camera.view_width, oy:oy + camera.view_height]
+
+    #several cells per pixel: nearest cell under each pixel, coloured by tile
+    def sample(self, board, camera):
+        cs = camera.cell_size
+        xs = ((np.arange(camera.view_width) + camera.x) / cs).astype(np.intp)
+        ys = ((np.arange(camera.view_height) + camera.y) / cs).astype(np.intp)
+        xs = xs[xs < camera.cols]
+        ys = ys[ys < camera.rows]
+        ids = TILE_LUT[board[np.ix_(ys, xs)]]
+        return self.colors[ids.T]
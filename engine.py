@@ -0,0 +1,451 @@
+import importlib
+import random
+from array import array
+from functools import lru_cache
+
+#Level presets: difficulty -> (rows, cols, mines)
+DIFFICULTIES = {
+    1: (9, 12, 15),  #Easy
+    2: (16, 16, 40),  #Medium
+    3: (16, 30, 99),  #Hard
+    }
+
+MINE = -1 #value() of a mine cell
+
+#Cell byte layout: low 4 bits hold the neighbor mine count (kept for mine
+#cells too, so removing a mine needs no recount), then one bit per flag
+COUNT_MASK = 0x0F
+MINE_BIT = 0x10
+REVEALED_BIT = 0x20
+FLAGGED_BIT = 0x40
+
+#bytes.translate tables for whole-board passes at C speed
+KEEP_FLAGS = bytes(b & FLAGGED_BIT for b in range(256))
+REVEAL_MINES = bytes(b | REVEALED_BIT if b & MINE_BIT else b for b in range(256))
+
+#counters saved next to the cells by snapshot()
+GAME_STATE = ("mines", "safe_left", "flags_placed", "first_move_done", "generated", "edited", "game_over", "win", "exploded")
+
+
+#Headless game rules, no pygame here so it can run on servers
+class MinesweeperEngine:
+    #lazy=True only records the dimensions, the layout is generated by the
+    #first reveal with its 3x3 safe zone already excluded
+    def __init__(self, rows, cols, mines, seed=None, lazy=False):
+        if rows < 1 or cols < 1:
+            raise ValueError("rows and cols must be at least 1")
+        if not 0 <= mines < rows * cols:
+            raise ValueError("mines must be between 0 and rows*cols - 1")
+
+        self.rows = rows
+        self.cols = cols
+        self.mines = mines
+        self.random = random.Random(seed)
+        self.around = neighbor_lookup(rows, cols) #flat index -> flat neighbor indices
+
+        self.init_board()
+        self.game_over = False
+        self.win = False
+        self.exploded = None #the mine that ended the game
+
+        #running counters kept by the mutators, so no method rescans the board
+        self.safe_left = rows * cols - mines #safe cells still hidden
+        self.flags_placed = 0
+        self.first_move_done = False
+
+        self.generated = False
+        self.edited = False #mines were added or removed by hand
+        if not lazy:
+            self.generate()
+
+    def generate(self, exclude=()):
+        self.place_mines(exclude)
+        self.calculate_numbers()
+        self.generated = True
+
+    #storage hook, backends override this to use other containers.
+    #One byte per cell (see COUNT_MASK and the *_BIT flags), flat and
+    #row-major: cell (r, c) is index r*cols + c
+    def init_board(self):
+        self.cells = bytearray(self.rows * self.cols)
+        self.work_queue = None #flood fill stack, allocated on first use
+
+    #The whole game in one bytes copy plus the counters
+    def snapshot(self):
+        return self.board_snapshot(), tuple(getattr(self, name) for name in GAME_STATE)
+
+    def restore(self, snapshot):
+        board, state = snapshot
+        self.restore_board(board)
+        for name, value in zip(GAME_STATE, state):
+            setattr(self, name, value)
+
+    def board_snapshot(self):
+        return bytes(self.cells)
+
+    def restore_board(self, board):
+        self.cells[:] = board #in place, views of the buffer stay valid
+
+    @classmethod
+    def from_difficulty(cls, difficulty, seed=None, **options):
+        rows, cols, mines = DIFFICULTIES[difficulty]
+        return cls(rows, cols, mines, seed, **options)
+
+    def in_bounds(self, r, c):
+        return 0 <= r < self.rows and 0 <= c < self.cols
+
+    def neighbors(self, r, c):
+        i = r * self.cols + c
+        for j in self.around(i):
+            yield divmod(j, self.cols)
+
+    #cell accessors, the rules below go through these so backends with other
+    #storage only need to override them
+    def is_mine(self, r, c):
+        return bool(self.cells[r * self.cols + c] & MINE_BIT)
+
+    def value(self, r, c): #neighbor count, or MINE
+        cell = self.cells[r * self.cols + c]
+        return MINE if cell & MINE_BIT else cell & COUNT_MASK
+
+    def is_revealed(self, r, c):
+        return bool(self.cells[r * self.cols + c] & REVEALED_BIT)
+
+    def is_flagged(self, r, c):
+        return bool(self.cells[r * self.cols + c] & FLAGGED_BIT)
+
+    def set_flag(self, r, c, flagged):
+        if flagged:
+            self.cells[r * self.cols + c] |= FLAGGED_BIT
+        else:
+            self.cells[r * self.cols + c] &= ~FLAGGED_BIT
+
+    @property
+    def finished(self):
+        return self.game_over or self.win
+
+    #Lay out self.mines mines from scratch, never on the excluded (r, c) cells.
+    #Flags placed before generation are kept
+    def place_mines(self, exclude=()):
+        cols = self.cols
+        skipped = [r * cols + c for r, c in exclude]
+        cells = self.cells
+        cells[:] = cells.translate(KEEP_FLAGS)
+        for i in sample_mines(self.rows * cols, self.mines, skipped, self.random):
+            cells[i] |= MINE_BIT
+
+    def calculate_numbers(self):
+        cells = self.cells
+        around = self.around
+        for i in range(len(cells)):
+            #hitung bom di 8 tetangga
+            count = 0
+            for j in around(i):
+                if cells[j] & MINE_BIT:
+                    count += 1
+            cells[i] = (cells[i] & ~COUNT_MASK) | count
+
+    #Edits apply to a real layout: a lazy board is generated on the first
+    #edit, and from then on the board is played as it is (see clear_first_click)
+    def start_edit(self):
+        if not self.generated:
+            self.generate()
+        self.edited = True
+
+    #same bound as __init__, a board keeps at least one safe cell
+    def check_mine_limit(self):
+        if self.mines + 1 >= self.rows * self.cols:
+            raise ValueError("mines must be between 0 and rows*cols - 1")
+
+    #Mine edits that keep the counts right by touching only the 3x3 around
+    #the cell, instead of a calculate_numbers() pass over the whole board
+    def add_mine(self, r, c):
+        self.start_edit()
+        i = r * self.cols + c
+        cells = self.cells
+        if cells[i] & MINE_BIT:
+            return False
+        if cells[i] & REVEALED_BIT:
+            raise ValueError(f"cannot put a mine on revealed cell {(r, c)}")
+        self.check_mine_limit()
+
+        cells[i] |= MINE_BIT
+        for j in self.around(i):
+            cells[j] += 1
+
+        self.mines += 1
+        self.safe_left -= 1
+        return True
+
+    def remove_mine(self, r, c):
+        self.start_edit()
+        i = r * self.cols + c
+        cells = self.cells
+        if not cells[i] & MINE_BIT:
+            return False
+
+        cells[i] &= ~MINE_BIT
+        for j in self.around(i):
+            cells[j] -= 1
+
+        self.mines -= 1
+        if not cells[i] & REVEALED_BIT:
+            self.safe_left += 1
+        return True
+
+    #Batched form. Returns how many edits changed the board
+    def edit_mines(self, add=(), remove=()):
+        changed = 0
+        for r, c in remove:
+            changed += self.remove_mine(r, c)
+        for r, c in add:
+            changed += self.add_mine(r, c)
+        return changed
+
+    #Iterative fill with an explicit stack of flat indices. Cells are marked
+    #revealed when pushed, so each one is visited once. Returns the newly
+    #revealed cells as (r, c)
+    def flood_fill(self, r, c):
+        if not self.in_bounds(r, c):
+            return []
+        start = r * self.cols + c
+        cells = self.cells
+        if cells[start] & (REVEALED_BIT | FLAGGED_BIT):
+            return []
+
+        around = self.around
+        if self.work_queue is None:
+            self.work_queue = array("i", bytes(len(cells) * array("i").itemsize))
+        stack = self.work_queue #a cell is pushed at most once, so it never overflows
+        opened = []
+
+        cells[start] |= REVEALED_BIT
+        stack[0] = start
+        top = 1
+        while top:
+            top -= 1
+            i = stack[top]
+            opened.append(i)
+
+            #If a cell has a number (1-8), stop flood fill
+            #Only continue if the cell is empty (0)
+            if cells[i] & (MINE_BIT | COUNT_MASK):
+                continue
+            for j in around(i):
+                if not cells[j] & (REVEALED_BIT | FLAGGED_BIT):
+                    cells[j] |= REVEALED_BIT
+                    stack[top] = j
+                    top += 1
+
+        self.safe_left -= len(opened)
+        cols = self.cols
+        return [divmod(i, cols) for i in opened]
+
+    def is_first_move(self):
+        return not self.first_move_done
+
+    #3x3 around (r, c), or just (r, c) when the board is too dense for it
+    def safe_zone(self, r, c):
+        zone = [(r, c)] + list(self.neighbors(r, c))
+        if self.rows * self.cols - len(zone) < self.mines:
+            return [(r, c)]
+        return zone
+
+    #Guarantee first click to be safe: if the safe zone around (r, c) has a
+    #mine, redraw the whole layout with that zone excluded. A layout that
+    #already avoids the zone is kept, so the result stays uniform over such
+    #layouts. A hand-edited layout is never redrawn
+    def clear_first_click(self, r, c):
+        if self.edited:
+            return
+        if not self.generated:
+            self.generate(self.safe_zone(r, c))
+            return
+
+        cells_to_clear = self.safe_zone(r, c)
+        if any(self.is_mine(i, j) for i, j in cells_to_clear):
+            self.generate(cells_to_clear)
+
+    #Left click. Returns the newly revealed cells, empty when the move is ignored
+    def reveal(self, r, c):
+        if self.finished or not self.in_bounds(r, c):
+            return []
+        if self.is_revealed(r, c) or self.is_flagged(r, c):
+            return []
+
+        if self.is_first_move():
+            self.clear_first_click(r, c)
+            self.first_move_done = True
+
+        if self.is_mine(r, c): #clicked on a mine
+            self.game_over = True
+            self.exploded = (r, c)
+            self.reveal_all_mines()
+            return [(r, c)]
+
+        newly_revealed = self.flood_fill(r, c)
+        self.check_win()
+        return newly_revealed
+
+    #Right click. Returns False when the flag could not be toggled
+    def toggle_flag(self, r, c):
+        if self.finished or not self.in_bounds(r, c):
+            return False
+        if self.is_revealed(r, c):
+            return False
+
+        if self.is_flagged(r, c):
+            self.set_flag(r, c, False)
+            self.flags_placed -= 1
+            return True
+
+        if self.flags_placed < self.mines:
+            self.set_flag(r, c, True)
+            self.flags_placed += 1
+            return True
+        return False
+
+    #Open every unflagged neighbor of a number whose flags are all placed.
+    #Returns the newly revealed cells like reveal()
+    def chord(self, r, c):
+        if self.finished or not self.in_bounds(r, c):
+            return []
+        value = self.value(r, c)
+        if not self.is_revealed(r, c) or value <= 0:
+            return []
+
+        around = list(self.neighbors(r, c))
+        flags = sum(1 for i, j in around if self.is_flagged(i, j))
+        if flags != value:
+            return []
+
+        newly_revealed = []
+        for i, j in around:
+            if self.is_revealed(i, j) or self.is_flagged(i, j):
+                continue
+            if self.is_mine(i, j):
+                self.game_over = True
+                self.exploded = (i, j)
+                newly_revealed.append((i, j))
+            else:
+                newly_revealed.extend(self.flood_fill(i, j))
+
+        if self.game_over:
+            self.reveal_all_mines()
+        elif newly_revealed:
+            self.check_win()
+        return newly_revealed
+
+    def flags_used(self):
+        return self.flags_placed
+
+    def mines_left(self):
+        return self.mines - self.flags_placed
+
+    def reveal_all_mines(self):
+        self.cells[:] = self.cells.translate(REVEAL_MINES)
+
+    def check_win(self):
+        if self.safe_left == 0 and not self.game_over:
+            self.win = True
+        return self.win
+
+
+#Neighbor table for a board shape in CSR form: the neighbors of flat cell i
+#are indices[offsets[i]:offsets[i+1]]. Built once per shape and shared by
+#every game of that shape, so hot loops do no bounds arithmetic
+@lru_cache(maxsize=8)
+def neighbor_table(rows, cols):
+    col_spans = [range(max(0, c-1), min(cols, c+2)) for c in range(cols)]
+    offsets = array("i", [0])
+    indices = array("i")
+    for r in range(rows):
+        bases = [i * cols for i in range(max(0, r-1), min(rows, r+2))]
+        me = r * cols
+        for span in col_spans:
+            indices.extend([b + j for b in bases for j in span if b + j != me])
+            offsets.append(len(indices))
+            me += 1
+    return offsets, indices
+
+
+#Boards up to this many cells get a neighbor table (about 36 bytes a cell,
+#so at most ~2.4 MB per shape and ~19 MB for the whole cache). Bigger
+#boards use the arithmetic lookup, which needs no setup
+TABLE_MAX_CELLS = 1 << 16
+
+
+#Function mapping a flat cell index to its flat neighbor indices. Uses the
+#cached table when the board is small enough, otherwise interior cells get
+#their 8 neighbors from fixed offsets and only border cells do range math
+def neighbor_lookup(rows, cols):
+    if rows * cols <= TABLE_MAX_CELLS:
+        offsets, indices = neighbor_table(rows, cols)
+
+        def around(i):
+            return indices[offsets[i]:offsets[i + 1]]
+        return around
+
+    def around(i):
+        r, c = divmod(i, cols)
+        if 0 < r < rows - 1 and 0 < c < cols - 1:
+            return (i - cols - 1, i - cols, i - cols + 1, i - 1, i + 1, i + cols - 1, i + cols, i + cols + 1)
+        return [x * cols + y for x in range(max(0, r-1), min(rows, r+2))
+                for y in range(max(0, c-1), min(cols, c+2)) if x != r or y != c]
+    return around
+
+#Uniform sample of `mines` distinct flat indices in range(size), skipping the
+#`exclude` indices, in one pass with no retry loop. Above 50% density the
+#safe cells are drawn instead and the rest become mines. `seed` may be a
+#random.Random to draw from or anything random.Random() accepts
+def sample_mines(size, mines, exclude=(), seed=None):
+    rng = seed if isinstance(seed, random.Random) else random.Random(seed)
+    free, remap = free_cells(size, exclude)
+    if not 0 <= mines <= free:
+        raise ValueError(f"cannot place {mines} mines in {free} free cells")
+
+    if mines * 2 > free:
+        keep = set(rng.sample(range(free), free - mines))
+        picks = [x for x in range(free) if x not in keep]
+    else:
+        picks = rng.sample(range(free), mines)
+
+    if remap:
+        picks = [remap.get(x, x) for x in picks]
+    return picks
+
+
+#Yields the positions of the set bits of x, lowest first
+def iter_bits(x):
+    bits = bin(x)[:1:-1] #reversed, so string index == bit index
+    i = bits.find("1")
+    while i != -1:
+        yield i
+        i = bits.find("1", i + 1)
+
+
+#Samplers draw from range(free) and then apply remap: each excluded index
+#below `free` stands in for one allowed index at or above it, so the draw
+#maps one-to-one onto the allowed cells
+def free_cells(size, exclude):
+    excluded = set(exclude)
+    free = size - len(excluded)
+    low = sorted(e for e in excluded if e < free)
+    high = [x for x in range(free, size) if x not in excluded]
+    return free, dict(zip(low, high))
+
+
+#backend name -> (module, class), imported lazily so optional dependencies stay optional
+BACKENDS = {
+    "python": ("engine", "MinesweeperEngine"),
+    "numpy": ("numpy_engine", "NumpyEngine"),
+    "bitboard": ("bitboard_engine", "BitboardEngine"),
+    }
+
+
+def create_engine(rows, cols, mines, seed=None, backend="python", **options):
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend {backend!r}, expected one of {sorted(BACKENDS)}")
+    module_name, class_name = BACKENDS[backend]
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)(rows, cols, mines, seed, **options)
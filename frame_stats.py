@@ -0,0 +1,61 @@
+from collections import deque
+
+SECTIONS = ("events", "click", "draw", "present")
+
+#A frame lands in the first bucket whose rate its busy time could sustain
+FPS_BUCKETS = (240, 120, 60, 30, 0)
+
+
+#Rolling per-frame timings for the debug overlay. The game loop reports the
+#busy time of each frame split into event handling, draw() and presenting;
+#handle_click time and the last flood fill are reported as they happen.
+#"events" excludes the click time so the sections add up to the frame
+class FrameStats:
+    def __init__(self, window=120):
+        self.samples = {name: deque(maxlen=window) for name in SECTIONS}
+        self.busy = deque(maxlen=window)
+        self.click = 0.0 #handle_click seconds in the current frame
+        self.fill_cells = 0
+        self.fill_seconds = 0.0
+
+    def add_click(self, seconds):
+        self.click += seconds
+
+    def add_fill(self, cells, seconds):
+        self.fill_cells = cells
+        self.fill_seconds = seconds
+
+    def end_frame(self, events, draw, present):
+        times = {"events": events - self.click, "click": self.click, "draw": draw, "present": present}
+        for name in SECTIONS:
+            self.samples[name].append(times[name])
+        self.busy.append(events + draw + present)
+        self.click = 0.0
+
+    def mean_ms(self, name):
+        samples = self.samples[name]
+        return 1000 * sum(samples) / len(samples) if samples else 0.0
+
+    def max_ms(self, name):
+        return 1000 * max(self.samples[name], default=0.0)
+
+    def histogram(self):
+        counts = [0] * len(FPS_BUCKETS)
+        for seconds in self.busy:
+            fps = 1 / seconds if seconds > 0 else float("inf")
+            for k, low in enumerate(FPS_BUCKETS):
+                if fps >= low:
+                    counts[k] += 1
+                    break
+        return counts
+
+    #text for the overlay, one string per line
+    def lines(self, bar_width=16):
+        lines = [f"{name:<8}{self.mean_ms(name):7.2f} ms  max {self.max_ms(name):7.2f}" for name in SECTIONS]
+        counts = self.histogram()
+        top = max(counts) or 1
+        for low, count in zip(FPS_BUCKETS, counts):
+            label = f"{low}+" if low else f"<{FPS_BUCKETS[-2]}"
+            lines.append(f"fps {label:>5} {'#' * (count * bar_width // top):<{bar_width}} {count}")
+        lines.append(f"fill {self.fill_cells} cells {self.fill_seconds * 1e6:.0f} us")
+        return lines
@@ -0,0 +1,73 @@
+import threading
+
+import pygame
+
+from engine import MinesweeperEngine
+from probability import mine_probabilities
+from solver import Cancelled, solve
+
+#Hints are computed on boards with at most this many cells
+HINT_MAX_CELLS = 1 << 16
+
+
+#The hint for a position: a cell the revealed numbers prove safe, else the
+#unflagged cell least likely to be a mine. Flags are the player's guesses,
+#so they are not trusted. Returns ((r, c), chance of a mine), or None
+#when there is nothing to hint or cancelled() turned True on the way
+def find_hint(engine, cancelled=None):
+    try:
+        safe, _ = solve(engine, trust_flags=False, cancelled=cancelled)
+        if safe:
+            safe.sort(key=lambda cell: engine.is_flagged(*cell)) #unflagged first
+            return safe[0], 0.0
+        chances = mine_probabilities(engine, trust_flags=False, cancelled=cancelled)
+    except Cancelled:
+        return None
+    if not chances:
+        return None
+    open_cells = [cell for cell in chances if not engine.is_flagged(*cell)] or list(chances)
+    best = min(open_cells, key=chances.get)
+    return best, chances[best]
+
+
+#Runs find_hint on a background thread so the event loop never waits on
+#it. Each submit() copies the board and supersedes any earlier request;
+#results are posted as pygame events of `event_type` carrying the version
+#they were computed for, and anything older than the latest submit() or
+#cancel() is dropped. A superseded search notices at its next poll (see
+#solver.Cancelled) and the thread moves straight on to the latest request
+class HintWorker:
+    def __init__(self, event_type):
+        self.event_type = event_type
+        self.wake = threading.Condition()
+        self.request = None #(version, rows, cols, mines, snapshot)
+        self.version = 0
+        self.thread = threading.Thread(target=self.run, name="hints", daemon=True)
+        self.thread.start()
+
+    def submit(self, engine):
+        with self.wake:
+            self.version += 1
+            self.request = (self.version, engine.rows, engine.cols, engine.mines, engine.snapshot())
+            self.wake.notify()
+            return self.version
+
+    def cancel(self):
+        with self.wake:
+            self.version += 1
+            self.request = None
+
+    def run(self):
+        while True:
+            with self.wake:
+                while self.request is None:
+                    self.wake.wait()
+                version, rows, cols, mines, snapshot = self.request
+                self.request = None
+
+            engine = MinesweeperEngine(rows, cols, mines, lazy=True)
+            engine.restore(snapshot)
+            hint = find_hint(engine, lambda: version != self.version)
+            if hint and version == self.version:
+                cell, chance = hint
+                pygame.event.post(pygame.event.Event(self.event_type, version=version, cell=cell, chance=chance))
@@ -1,33 +1,38 @@
+import argparse
+import math
 import pygame
 import sys
-import random
-
-#Display Setting
-WHITE = (255, 255, 255)
-BLACK = (0, 0, 0)
-RED = (255, 0, 0)
-BLUE = (0, 0, 255)
-GRAY = (192, 192, 192)
-DARK_GRAY = (128, 128, 128)
-LIGHT_GRAY = (220, 220, 220)
-
-#Number Colors
-NUMBER_COLORS = {
-    1: (0, 0, 255),
-    2: (0, 128, 0),
-    3: (255, 0, 0),
-    4: (0, 0, 128),
-    5: (128, 0, 0),
-    6: (0, 128, 128),
-    7: (0, 0, 0),
-    8: (128, 128, 128)
-    }
+import time
+
+from camera import Camera
+from colors import BLACK, DARK_GRAY, GREEN, ORANGE, RED, WHITE
+from engine import DIFFICULTIES, MinesweeperEngine, create_engine
+from frame_stats import FrameStats
+from hints import HINT_MAX_CELLS, HintWorker
+from no_guess import NO_GUESS_MAX_CELLS, NO_GUESS_MAX_DENSITY, NoGuessEngine
+from text_cache import TextCache
+from tile_grid import TileGrid
+from tiles import build_tiles, scale_tiles, tile_at
+
+try: #vectorised zoomed-out rendering, needs numpy
+    from compositor import COMPOSITE_MAX_CELL, SurfarrayCompositor
+except ImportError:
+    SurfarrayCompositor = None
 
 CELL_SIZE = 30
 TOP_BAR_HEIGHT = 60 #status bar height
+MAX_VIEW_SIZE = (1200, 780) #largest board area shown, bigger boards scroll
+PAN_STEP = 90 #pixels per arrow key press
+LARGE_BOARD_CELLS = 250000 #above this the numpy backend is used when installed
+MIN_TILE_SIZE = 2 #smaller cells can only be drawn by the compositor
+
+CLOCK_TICK = pygame.USEREVENT #once a second while the timer runs
+HINT_READY = pygame.USEREVENT + 1 #posted by the hint thread
 
 class MinesweeperGame:
-    def __init__(self):
+    #custom: optional (rows, cols, mines) offered as level 4 in the menu.
+    #no_guess: boards that can be solved from the first click without guessing
+    def __init__(self, custom=None, no_guess=False):
         pygame.init()
         pygame.mixer.init()
 
@@ -37,277 +42,482 @@ class MinesweeperGame:
         self.sfx_victory = pygame.mixer.Sound("Audio/victory.WAV")
         
         pygame.display.set_caption("Minesweeper")
-        self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont("arial", 22)
         self.large_font = pygame.font.SysFont("arial", 24, bold=True)
         self.huge_font = pygame.font.SysFont("arial", 50, bold=True) 
+        self.text = TextCache()
+        self.stats_font = pygame.font.SysFont("monospace", 14)
         self.state = 'MENU'  # MENU, PLAYING, GAME_OVER, WIN
-        self.screen = pygame.display.set_mode((400, 300)) #Ukuran menu awal
+        self.open_window((400, 300)) #Ukuran menu awal
+        self.tile_sets = {CELL_SIZE: self.load_tiles()}
+        self.tiles = self.tile_sets[CELL_SIZE]
+        self.compositor = SurfarrayCompositor(self.tiles) if SurfarrayCompositor else None
+        pygame.key.set_repeat(250, 40) #hold arrow keys to keep panning
+
+        self.levels = dict(DIFFICULTIES)
+        if custom:
+            self.levels[4] = custom
+        self.no_guess = no_guess
 
         self.start_time = 0
         self.elapsed_time = 0
         self.timer_active = False
+
+        #dirty tracking: cells changed since the last frame, or a full repaint
+        self.dirty_cells = []
+        self.full_redraw = True
+        self.drawn_status = None
+        self.grid = TileGrid() #visible cells as one reusable blit sequence
+
+        #F3 overlay: rolling frame timings and the last flood fill
+        self.stats = FrameStats()
+        self.show_stats = False
+        self.stats_rect = None
+
+        #H key: ((r, c), chance of a mine) outlined on the board, and the
+        #version of the request the hint thread is still working on
+        self.hints = HintWorker(HINT_READY)
+        self.hint = None
+        self.hint_version = None
     
     #Level Initialization
     def init_level(self, difficulty):
-        if difficulty == 1: #Easy
-            self.rows, self.cols, self.mines = 9, 12, 15
-        elif difficulty == 2: #Medium
-            self.rows, self.cols, self.mines = 16, 16, 40
-        elif difficulty == 3: #Hard
-            self.rows, self.cols, self.mines = 16, 30, 99
-        
-        #Resize Screen Based on Level
-        self.width = self.cols * CELL_SIZE
-        self.height = (self.rows * CELL_SIZE) + TOP_BAR_HEIGHT
-        self.screen = pygame.display.set_mode((self.width, self.height))
+        rows, cols, mines = self.levels[difficulty]
+        self.engine = self.make_engine(rows, cols, mines)
+        self.rows, self.cols, self.mines = rows, cols, mines
+
+        #Resize Screen Based on Level, boards bigger than MAX_VIEW_SIZE scroll
+        view_width = min(self.cols * CELL_SIZE, MAX_VIEW_SIZE[0])
+        view_height = min(self.rows * CELL_SIZE, MAX_VIEW_SIZE[1])
+        min_zoom = 0 if self.compositor else MIN_TILE_SIZE
+        self.camera = Camera(self.rows, self.cols, view_width, view_height, CELL_SIZE, min_zoom)
+        self.tiles = self.tile_sets[CELL_SIZE]
+
+        self.width = view_width
+        self.height = view_height + TOP_BAR_HEIGHT
+        self.open_window((self.width, self.height))
+        self.init_layers(view_width, view_height)
+        self.stats_rect = None
+        self.clear_hint()
+        self.full_redraw = True
 
         #timer
         self.start_time = pygame.time.get_ticks()
         self.elapsed_time = 0
         self.timer_active = True
+        pygame.time.set_timer(CLOCK_TICK, 1000)
 
-        #set data
-        self.grid = [[0 for _ in range(self.cols)] for _ in range(self.rows)] #0=empty, -1=mine
-        self.revealed = [[False for _ in range(self.cols)] for _ in range(self.rows)]
-        self.flagged = [[False for _ in range(self.cols)] for _ in range(self.rows)]
-        self.game_over = False
-        self.win = False
-
-        self.place_mines()
-
-        self.calculate_numbers()
-        
         self.state = "PLAYING"
 
-    def place_mines(self):
-        count = 0
-        while count < self.mines:
-            r = random.randint(0, self.rows - 1)
-            c = random.randint(0, self.cols - 1)
-            if self.grid[r][c] != -1:
-                self.grid[r][c] = -1
-                count += 1
-    
-    def calculate_numbers(self):
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if self.grid[r][c] == -1:
-                    continue
-
-                #hitung bom di 8 tetangga
-                count = 0
-                for i in range(max(0, r-1), min(self.rows, r+2)):
-                    for j in range(max(0, c-1), min(self.cols, c+2)):
-                        if self.grid[i][j] == -1:
-                            count += 1
-                self.grid[r][c] = count
-    
+    #Frontend hooks, overridden by the SDL2 renderer frontend (sdl2_frontend.py)
+    def open_window(self, size):
+        self.screen = pygame.display.set_mode(size)
+
+    def load_tiles(self):
+        return build_tiles(CELL_SIZE, self.font) #needs a display mode to convert to
+
+    #off-screen layers: the visible grid is only touched when cells change,
+    #the status bar at most once a second; a frame composites the two
+    def init_layers(self, view_width, view_height):
+        self.board_surface = pygame.Surface((view_width, view_height)).convert()
+        self.status_surface = pygame.Surface((self.width, TOP_BAR_HEIGHT)).convert()
+
+    def present(self, rects):
+        pygame.display.update(rects)
+
+    def make_engine(self, rows, cols, mines):
+        if self.no_guess and rows * cols <= NO_GUESS_MAX_CELLS and mines <= rows * cols * NO_GUESS_MAX_DENSITY:
+            return NoGuessEngine(rows, cols, mines) #layout searched for on the first click
+        #whole-board passes on huge custom boards are vectorised when numpy is around
+        if rows * cols > LARGE_BOARD_CELLS:
+            try:
+                return create_engine(rows, cols, mines, backend="numpy", lazy=True)
+            except ImportError:
+                pass
+        return MinesweeperEngine(rows, cols, mines, lazy=True) #mines are laid out on the first click
 
-    #DFS
-    def flood_fill(self, r, c):
-        if not (0 <= r < self.rows and 0 <= c < self.cols):
-            return
-        if self.revealed[r][c] or self.flagged[r][c]:
-            return
-        
-        self.revealed[r][c] = True
-
-        #If a cell has a number (1-8), stop flood fill
-        #Only continue if the cell is empty (0)
-        if self.grid[r][c] == 0:
-            for i in range(max(0, r-1), min(self.rows, r+2)):
-                for j in range(max(0, c-1), min(self.cols, c+2)):
-                        self.flood_fill(i, j)
-    
     def handle_click(self, pos, button):
        if self.state != "PLAYING": return
 
        x, y = pos
        if y < TOP_BAR_HEIGHT: return 
        
-       r = (y - TOP_BAR_HEIGHT) // CELL_SIZE
-       c = x // CELL_SIZE
+       cell = self.camera.cell_at(x, y - TOP_BAR_HEIGHT) #through the view transform
+       if cell is None: return
+       r, c = cell
 
        if button == 1: # Left Click (Buka)
-            if not any(any(row) for row in self.revealed): #Guarantee first click to be safe
-                cells_to_clear = [(r,c)] # cells to be cleared on first click
-
-                for i in range(max(0, r-1), min(self.rows, r+2)):
-                    for j in range(max(0, c-1), min(self.cols, c+2)):
-                        if (i,j) != (r,c): # ignore the clicked cell
-                            cells_to_clear.append((i,j))
-
-                mines_to_move = [] #list of mines to be relocated
-                for cr, cc in cells_to_clear:
-                    if self.grid[cr][cc] == -1:
-                        self.grid[cr][cc] = 0
-                        mines_to_move.append((cr, cc))
-
-                for _ in mines_to_move:
-                    placed = False
-                    while not placed:
-                        rr = random.randint(0, self.rows - 1)
-                        cc = random.randint(0, self.cols - 1)
-                        if self.grid[rr][cc] != -1 and (rr, cc) not in cells_to_clear: #make sure new location is not a mine and not in cleared cells
-                            self.grid[rr][cc] = -1
-                            placed = True
-                self.calculate_numbers() #recalculate numbers after moving mines
-
-            
-            if self.grid[r][c] == -1: #clicked on a mine
-                self.sfx_bomb.play() #mine sound
-                self.revealed[r][c] = True
-                self.game_over = True
-                self.state = "GAMEOVER"
-                self.reveal_all_mines()
-                self.timer_active = False
-            else:
-                self.sfx_click.play() # click sound
-                self.flood_fill(r, c)
-                self.check_win()
+            start = time.perf_counter()
+            opened = self.engine.reveal(r, c)
+            if opened:
+                self.stats.add_fill(len(opened), time.perf_counter() - start)
+                self.dirty_cells.extend(opened)
+                if self.engine.game_over:
+                    self.sfx_bomb.play() #mine sound
+                else:
+                    self.sfx_click.play() # click sound
+
+       elif button == 2: # Middle Click (Chord)
+            start = time.perf_counter()
+            opened = self.engine.chord(r, c)
+            if opened:
+                self.stats.add_fill(len(opened), time.perf_counter() - start)
+                self.dirty_cells.extend(opened)
+                if self.engine.game_over:
+                    self.sfx_bomb.play()
+                else:
+                    self.sfx_click.play()
 
        elif button == 3: # Right Click (Flag)
-            if not self.revealed[r][c]:
-
-                if self.flagged[r][c]:
-                    self.sfx_flag.play() #flag sound
-                    self.flagged[r][c] = False
-
-                else:
-                    flags_used = sum(row.count(True) for row in self.flagged) #count current flags
-                    if flags_used < self.mines:
-                        self.sfx_flag.play() #flag sound
-                        self.flagged[r][c] = True
-
-    def reveal_all_mines(self):
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if self.grid[r][c] == -1:
-                    self.revealed[r][c] = True
-
-    def check_win(self):
-        count_revealed = sum(row.count(True) for row in self.revealed)
-        total_safe_cells = (self.rows * self.cols) - self.mines
-        if count_revealed == total_safe_cells:
-            self.win = True
+            if self.engine.toggle_flag(r, c):
+                self.dirty_cells.append((r, c))
+                self.sfx_flag.play() #flag sound
+
+       self.update_state()
+       if self.dirty_cells:
+            self.board_changed()
+
+    #sync view state with the engine after a move
+    def update_state(self):
+        if self.engine.game_over:
+            self.state = "GAMEOVER"
+            self.stop_timer()
+            self.full_redraw = True #every mine was revealed
+        elif self.engine.win:
             self.state = "WIN"
-            self.timer_active = False
+            self.stop_timer()
             self.sfx_victory.play()#victory sound
 
+    def update_timer(self):
+        if self.timer_active:
+            self.elapsed_time = (pygame.time.get_ticks() - self.start_time) // 1000
+
+    def stop_timer(self):
+        self.update_timer()
+        self.timer_active = False
+        pygame.time.set_timer(CLOCK_TICK, 0)
+
+    #Hints are searched on the hint thread; a newer board supersedes the search
+    def request_hint(self):
+        if self.state != "PLAYING" or self.rows * self.cols > HINT_MAX_CELLS:
+            return
+        if self.engine.is_first_move(): #the first click is always safe
+            self.show_hint((self.rows // 2, self.cols // 2), 0.0)
+            return
+        self.hint_version = self.hints.submit(self.engine)
+
+    def show_hint(self, cell, chance):
+        self.hint = (cell, chance)
+        self.hint_version = None
+        self.full_redraw = True
+
+    def clear_hint(self):
+        self.hints.cancel()
+        self.hint_version = None
+        if self.hint:
+            self.hint = None
+            self.full_redraw = True #repaint without the outline
+
+    #after a move a shown hint is stale and a pending one starts over
+    def board_changed(self):
+        pending = self.hint_version is not None
+        self.clear_hint()
+        if pending:
+            self.request_hint()
+
+    #Camera moves repaint the board layer from the cells now in view
+    def pan(self, dx, dy):
+        if self.camera.pan(dx, dy):
+            self.full_redraw = True
+
+    def zoom(self, steps, pos):
+        x, y = pos
+        if self.camera.zoom(steps, x, max(0, y - TOP_BAR_HEIGHT)):
+            size = self.camera.cell_size
+            if size >= MIN_TILE_SIZE:
+                if size not in self.tile_sets:
+                    self.tile_sets[size] = scale_tiles(self.tile_sets[CELL_SIZE], size)
+                self.tiles = self.tile_sets[size]
+            self.full_redraw = True
+
+    #Repaints only what changed since the last frame and returns the screen
+    #rects to push with pygame.display.update()
     def draw(self):
-        self.screen.fill(GRAY)
-        
         #Draw Menu
         if self.state == "MENU":
-            self.screen.fill(DARK_GRAY)
-            title = self.large_font.render("MINESWEEPER", True, WHITE)
-            t1 = self.font.render("BEGINNER", True, WHITE)
-            t2 = self.font.render("INTERMEDIATE", True, WHITE)
-            t3 = self.font.render("EXPERT", True, WHITE)
-            
-            self.screen.blit(title, (100, 50))
-            self.screen.blit(t1, (140, 120))
-            self.screen.blit(t2, (140, 160))
-            self.screen.blit(t3, (140, 200))
-            return
+            if not self.full_redraw:
+                return []
+            self.full_redraw = False
+            self.draw_menu()
+            return [self.screen.get_rect()]
+
+        rects = []
+        if self.status_changed():
+            self.draw_status_bar()
+            rects.append(self.screen.blit(self.status_surface, (0, 0)))
+
+        if self.full_redraw or self.dirty_cells:
+            rects.extend(rect.move(0, TOP_BAR_HEIGHT) for rect in self.draw_board())
+            self.draw_hint()
+            self.screen.blit(self.board_surface, (0, TOP_BAR_HEIGHT))
+
+        if self.show_stats:
+            rects.append(self.draw_stats())
+
+        self.dirty_cells.clear()
+        self.full_redraw = False
+        return rects
+
+    def draw_menu(self):
+        self.screen.fill(DARK_GRAY)
+        title = self.text.render(self.large_font, "MINESWEEPER", WHITE)
+        t1 = self.text.render(self.font, "BEGINNER", WHITE)
+        t2 = self.text.render(self.font, "INTERMEDIATE", WHITE)
+        t3 = self.text.render(self.font, "EXPERT", WHITE)
         
-        #STATUS BAR
-        pygame.draw.rect(self.screen, DARK_GRAY, (0, 0, self.width, TOP_BAR_HEIGHT))
+        self.screen.blit(title, (100, 50))
+        self.screen.blit(t1, (140, 120))
+        self.screen.blit(t2, (140, 160))
+        self.screen.blit(t3, (140, 200))
+        if 4 in self.levels:
+            rows, cols, mines = self.levels[4]
+            t4 = self.text.render(self.font, f"CUSTOM {rows}x{cols}", WHITE)
+            self.screen.blit(t4, (140, 240))
+        mode = self.text.render(self.font, f"G: NO-GUESS {'ON' if self.no_guess else 'OFF'}", WHITE)
+        self.screen.blit(mode, (140, 270))
+
+    #status bar only when what it shows changed
+    def status_changed(self):
+        status = (self.engine.mines_left(), self.elapsed_time, self.state, self.may_need_guess())
+        if self.full_redraw or status != self.drawn_status:
+            self.drawn_status = status
+            return True
+        return False
+
+    #No-guess mode is on but this board was dealt normally: too big or too
+    #dense for the search, or no guess-free layout was found in time
+    def may_need_guess(self):
+        if not self.no_guess:
+            return False
+        return not isinstance(self.engine, NoGuessEngine) or self.engine.guess_free is False
+
+    #a big flood fill is cheaper as one grid rect than thousands of small ones
+    def needs_full_repaint(self, r0, r1, c0, c1):
+        return (self.full_redraw or self.camera.cell_size < MIN_TILE_SIZE
+                or len(self.dirty_cells) > ((r1 - r0) * (c1 - c0)) // 4)
+
+    def use_compositor(self): #zoomed out, one blit_array
+        return self.compositor is not None and self.camera.cell_size <= COMPOSITE_MAX_CELL
+
+    #Brings the board layer up to date, returns the changed rects in view coordinates
+    def draw_board(self):
+        r0, r1, c0, c1 = self.camera.visible_cells()
+        full = self.needs_full_repaint(r0, r1, c0, c1)
+        if self.use_compositor(): #too many cells to keep a blit sequence for
+            if full:
+                self.compositor.render(self.board_surface, self.engine, self.camera, self.tiles, DARK_GRAY)
+                return [self.board_surface.get_rect()]
+            return self.board_surface.blits(
+                [(self.tiles[tile_at(self.engine, r, c)], self.camera.cell_origin(r, c))
+                 for r, c in self.dirty_cells if r0 <= r < r1 and c0 <= c < c1])
+
+        grid = self.grid
+        if self.full_redraw or not grid.matches(self.camera, self.tiles):
+            grid.build(self.engine, self.camera, self.tiles)
+            self.board_surface.fill(DARK_GRAY) #shows around boards smaller than the view
+            grid.blit(self.board_surface)
+            return [self.board_surface.get_rect()]
+
+        changed = grid.patch(self.engine, self.tiles, self.dirty_cells)
+        if full: #resubmit the whole sequence
+            grid.blit(self.board_surface)
+            return [self.board_surface.get_rect()]
+        return self.board_surface.blits(changed)
+
+    def draw_status_bar(self):
+        bar = self.status_surface
+        bar.fill(DARK_GRAY)
 
         text_y = (TOP_BAR_HEIGHT - self.large_font.get_height()) // 2
 
         #BOMB COUNTER
-        flags_used = sum(row.count(True) for row in self.flagged)
-        mines_left = self.mines - flags_used
-        text_mines = self.large_font.render(f"Bomb: {mines_left}", True, RED)
-        self.screen.blit(text_mines, (10, text_y))
+        mines_left = self.engine.mines_left()
+        text_mines = self.text.render(self.large_font, f"Bomb: {mines_left}", RED)
+        bar.blit(text_mines, (10, text_y))
 
         #TIMER
         minutes = self.elapsed_time // 60
         seconds = self.elapsed_time % 60
         time_text = f"{minutes:01d}:{seconds:02d}"
-        text_timer = self.large_font.render(time_text, True, RED)
+        text_timer = self.text.render(self.large_font, time_text, RED)
 
         timer_x = self.width - text_timer.get_width() - 10 
-        self.screen.blit(text_timer, (timer_x, text_y))
+        bar.blit(text_timer, (timer_x, text_y))
 
         #STATUS MSG
         msg = ""
-        if self.state == "PLAYING":
+        color = WHITE
+        if self.state == "PLAYING" and self.may_need_guess():
+            msg = "May guess!" #no-guess fell back to an ordinary board
+            color = ORANGE
+        elif self.state == "PLAYING":
             msg = "GudLuck!"
         elif self.state == "GAMEOVER":
             msg = "Game Over!"
         elif self.state == "WIN":
             msg = "You Win!"
             
-        text_status = self.large_font.render(msg, True, WHITE)
+        text_status = self.text.render(self.large_font, msg, color)
         status_x = (self.width // 2) - (text_status.get_width() // 2)
-        self.screen.blit(text_status, (status_x, text_y))
-
-        #GRID
-        for r in range(self.rows):
-            for c in range(self.cols):
-                rect = pygame.Rect(c * CELL_SIZE, TOP_BAR_HEIGHT + r * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-
-                if self.revealed[r][c]:
-                    pygame.draw.rect(self.screen, GRAY, rect)
-                    pygame.draw.rect(self.screen, BLACK, rect, 1) #bordernya
-
-                    val = self.grid[r][c]
-                    if val == -1: #bom (black dots)
-                        pygame.draw.circle(self.screen, BLACK, rect.center, CELL_SIZE // 4)
-                    elif val > 0: #angka
-                        text = self.font.render(str(val), True, NUMBER_COLORS.get(val, BLACK))
-                        text_rect = text.get_rect(center=rect.center)
-                        self.screen.blit(text, text_rect)
-                else:
-                    #kotak tertutup
-                    pygame.draw.rect(self.screen, GRAY, rect)
-
-                    #3D BORDERS
-                    pygame.draw.line(self.screen, WHITE, (rect.left, rect.bottom), (rect.left, rect.top))
-                    pygame.draw.line(self.screen, WHITE, (rect.right, rect.top), (rect.left, rect.top))
-                    pygame.draw.line(self.screen, DARK_GRAY, (rect.right - 1, rect.top), (rect.right - 1, rect.bottom))
-                    pygame.draw.line(self.screen, DARK_GRAY, (rect.left, rect.bottom - 1), (rect.right, rect.bottom - 1))
-
-                    if self.flagged[r][c]: #flag (segitiga merah)
-                        p1 = (rect.centerx - 5, rect.centery - 5)
-                        p2 = (rect.centerx + 5, rect.centery)
-                        p3 = (rect.centerx - 5, rect.centery + 5)
-                        pygame.draw.polygon(self.screen, RED, [p1, p2, p3])
-    
+        bar.blit(text_status, (status_x, text_y))
+
+    #Outline of the hinted cell in view coordinates and its colour: green when
+    #proven safe, orange for the best guess. None when there is nothing to show
+    def hint_outline(self):
+        if self.hint is None:
+            return None
+        (r, c), chance = self.hint
+        if not self.camera.is_visible(r, c):
+            return None
+        x, y = self.camera.cell_origin(r, c)
+        size = max(3, math.ceil(self.camera.cell_size))
+        return pygame.Rect(int(x), int(y), size, size), GREEN if chance == 0 else ORANGE
+
+    #Drawn over the board layer after the board; showing or clearing a hint
+    #repaints the whole board, which wipes the previous outline
+    def draw_hint(self):
+        outline = self.hint_outline()
+        if outline:
+            rect, color = outline
+            pygame.draw.rect(self.board_surface, color, rect, max(1, rect.width // 10))
+
+    def render_stats(self):
+        lines = self.stats.lines()
+        line_height = self.stats_font.get_linesize()
+        width = max(self.stats_font.size(line)[0] for line in lines)
+        panel = pygame.Surface((width + 8, line_height * len(lines) + 8))
+        panel.fill(BLACK)
+        for k, line in enumerate(lines):
+            panel.blit(self.stats_font.render(line, True, WHITE), (4, 4 + k * line_height))
+        return panel
+
+    #Overlay over the top-left of the board, redrawn every frame while on.
+    #The board layer is intact underneath, so last frame's panel is
+    #wiped by copying the layer back before drawing the new one
+    def draw_stats(self):
+        panel = self.render_stats()
+        rect = panel.get_rect(topleft=(0, TOP_BAR_HEIGHT)).clip(self.screen.get_rect())
+        if self.stats_rect:
+            rect.union_ip(self.stats_rect)
+        self.screen.blit(self.board_surface, rect.topleft, rect.move(0, -TOP_BAR_HEIGHT))
+        self.screen.blit(panel, (0, TOP_BAR_HEIGHT))
+        self.stats_rect = rect
+        return rect
+
+    def toggle_stats(self):
+        self.show_stats = not self.show_stats
+        self.stats_rect = None
+        self.full_redraw = True #repaint without the panel
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            sys.exit()
+
+        if event.type == CLOCK_TICK:
+            self.update_timer()
+        elif event.type == HINT_READY:
+            if event.version == self.hint_version and self.state == "PLAYING":
+                self.show_hint(event.cell, event.chance)
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.full_redraw = True #window contents were lost
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            self.toggle_stats()
+
+        if self.state == "MENU":
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_1:
+                    self.init_level(1) #Easy
+                elif event.key == pygame.K_2:
+                    self.init_level(2) #Medium
+                elif event.key == pygame.K_3:
+                    self.init_level(3) #Hard
+                elif event.key == pygame.K_4 and 4 in self.levels:
+                    self.init_level(4) #Custom
+                elif event.key == pygame.K_g:
+                    self.no_guess = not self.no_guess
+                    self.full_redraw = True
+            
+        elif self.state in ["PLAYING", "GAMEOVER", "WIN"]:
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                start = time.perf_counter()
+                self.handle_click(event.pos, event.button)
+                self.stats.add_click(time.perf_counter() - start)
+            if event.type == pygame.MOUSEWHEEL: #zoom around the mouse
+                self.zoom(event.y, pygame.mouse.get_pos())
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_r: #Restart ke menu
+                    self.clear_hint()
+                    self.state = "MENU"
+                    self.open_window((400, 300))
+                    self.full_redraw = True
+                    self.stop_timer()
+                elif event.key == pygame.K_h:
+                    self.request_hint()
+                elif event.key == pygame.K_LEFT:
+                    self.pan(-PAN_STEP, 0)
+                elif event.key == pygame.K_RIGHT:
+                    self.pan(PAN_STEP, 0)
+                elif event.key == pygame.K_UP:
+                    self.pan(0, -PAN_STEP)
+                elif event.key == pygame.K_DOWN:
+                    self.pan(0, PAN_STEP)
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                    self.zoom(1, (self.width // 2, self.height // 2))
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    self.zoom(-1, (self.width // 2, self.height // 2))
+
+    #Event driven: block until something happens (input, the one-second
+    #clock tick or a hint result), handle everything queued, then repaint
+    #what changed
     def run(self):
         while True:
-            if self.timer_active:
-                self.elapsed_time = (pygame.time.get_ticks() - self.start_time) // 1000
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                
-                if self.state == "MENU":
-                    if event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_1:
-                            self.init_level(1) #Easy
-                        elif event.key == pygame.K_2:
-                            self.init_level(2) #Medium
-                        elif event.key == pygame.K_3:
-                            self.init_level(3) #Hard
-                    
-                elif self.state in ["PLAYING", "GAMEOVER", "WIN"]:
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        self.handle_click(event.pos, event.button)
-                    if event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_r: #Restart ke menu
-                            self.state = "MENU"
-                            self.screen = pygame.display.set_mode((400, 300))
-                    
-            self.draw()
-            pygame.display.flip()
-            self.clock.tick(30)
+            event = pygame.event.wait()
+            start = time.perf_counter()
+            for event in [event] + pygame.event.get():
+                self.handle_event(event)
+            handled = time.perf_counter()
+
+            rects = self.draw()
+            drawn = time.perf_counter()
+            if rects:
+                self.present(rects)
+            self.stats.end_frame(handled - start, drawn - handled, time.perf_counter() - drawn)
 
 if __name__ == "__main__":
-    game = MinesweeperGame()
+    parser = argparse.ArgumentParser(description="Minesweeper")
+    parser.add_argument("--rows", type=int, help="custom board rows (menu key 4)")
+    parser.add_argument("--cols", type=int, help="custom board columns")
+    parser.add_argument("--mines", type=int, help="custom board mines")
+    parser.add_argument("--no-guess", action="store_true", help="only deal boards solvable without guessing")
+    parser.add_argument("--sdl2", action="store_true", help="draw with an SDL2 renderer and textures")
+    parser.add_argument("--software", action="store_true", help="with --sdl2, use SDL's software renderer")
+    args = parser.parse_args()
+
+    custom = None
+    given = [value is not None for value in (args.rows, args.cols, args.mines)]
+    if any(given):
+        if not all(given):
+            parser.error("--rows, --cols and --mines must be given together")
+        if args.rows < 1 or args.cols < 1:
+            parser.error("--rows and --cols must be at least 1")
+        if not 0 <= args.mines < args.rows * args.cols:
+            parser.error("--mines must be between 0 and rows*cols - 1")
+        custom = (args.rows, args.cols, args.mines)
+
+    if args.sdl2 or args.software:
+        from sdl2_frontend import SDL2MinesweeperGame #pygame._sdl2 is still experimental
+        game = SDL2MinesweeperGame(custom, args.no_guess, software=args.software)
+    else:
+        game = MinesweeperGame(custom, args.no_guess)
     game.run()
\ No newline at end of file
@@ -0,0 +1,114 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from functools import lru_cache
+from multiprocessing import get_context
+
+from engine import FLAGGED_BIT, MinesweeperEngine
+from solver import MASK_MAX_CELLS, play_safe
+
+#Boards the no-guess search is offered for, the solver's cached-mask limit
+NO_GUESS_MAX_CELLS = MASK_MAX_CELLS
+
+SEEDS_PER_TASK = 4 #candidates a worker checks per task
+MAX_SEEDS = 20000 #dense boards may have no guess-free layout at all
+SEARCH_SECONDS = 1.5 #the first click waits at most this long for a layout
+
+#Denser boards are not offered: guess-free layouts get rare fast. On one
+#core expert (0.21) takes ~0.02 s, 16x30 with 120 mines (0.25) up to 2 s
+#and with 130 mines (0.27) ~6 s
+NO_GUESS_MAX_DENSITY = 0.22
+
+
+#True when the layout of `seed` can be finished from the first click at
+#`first` with certain moves only
+def solvable(rows, cols, mines, first, seed):
+    engine = MinesweeperEngine(rows, cols, mines, seed, lazy=True)
+    engine.reveal(*first)
+    return play_safe(engine)
+
+
+#Worker task: the first solvable seed in range(start, start + count), or None
+def first_solvable(rows, cols, mines, first, start, count):
+    for seed in range(start, start + count):
+        if solvable(rows, cols, mines, first, seed):
+            return seed
+    return None
+
+
+#One pool for the whole process, started on first use. Spawned rather than
+#forked so workers never inherit the GUI's SDL threads
+@lru_cache(maxsize=1)
+def worker_pool(workers):
+    return ProcessPoolExecutor(workers, mp_context=get_context("spawn"))
+
+
+#Searches seeds base, base + 1, ... for a layout that needs no guess from
+#`first`. Tasks are handed out a few at a time and collected in seed order,
+#so the answer is the lowest solvable seed whatever the worker timing. At
+#the first success nothing more is submitted and queued tasks are cancelled
+#(the few already running are small). The search gives up after `seconds`
+#(None: no limit, only MAX_SEEDS). Returns the seed, or None
+def find_seed(rows, cols, mines, first, base, workers=None, seconds=SEARCH_SECONDS):
+    workers = workers or os.cpu_count() or 1
+    end = base + MAX_SEEDS
+    deadline = None if seconds is None else time.monotonic() + seconds
+    if workers == 1:
+        for start in range(base, end, SEEDS_PER_TASK):
+            if deadline is not None and time.monotonic() > deadline:
+                return None
+            seed = first_solvable(rows, cols, mines, first, start, SEEDS_PER_TASK)
+            if seed is not None:
+                return seed
+        return None
+
+    pool = worker_pool(workers)
+    pending = deque()
+    start = base
+    try:
+        while pending or start < end:
+            while len(pending) < 2 * workers and start < end:
+                pending.append(pool.submit(first_solvable, rows, cols, mines, first, start, SEEDS_PER_TASK))
+                start += SEEDS_PER_TASK
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            seed = pending.popleft().result(timeout)
+            if seed is not None:
+                return seed
+    except TimeoutError:
+        pass
+    finally:
+        for task in pending:
+            task.cancel()
+    return None
+
+
+#Lazy engine whose first click generates a layout that can be solved from
+#that click without guessing. Candidate layouts are seeded from self.random,
+#so a seeded engine still gives the same board for the same first click
+#(with seconds=None; under a time limit a slow machine may fall back to an
+#ordinary layout where a fast one found a guess-free one)
+class NoGuessEngine(MinesweeperEngine):
+    def __init__(self, rows, cols, mines, seed=None, workers=None, seconds=SEARCH_SECONDS):
+        self.workers = workers
+        self.seconds = seconds
+        self.guess_free = None #set by the first click: False when it fell back to an ordinary layout
+        super().__init__(rows, cols, mines, seed, lazy=True)
+
+    def clear_first_click(self, r, c):
+        seed = None
+        if not self.edited: #a hand-made layout is played as it is
+            seed = find_seed(self.rows, self.cols, self.mines, (r, c), self.random.getrandbits(32),
+                             self.workers, self.seconds)
+        self.guess_free = seed is not None
+        if seed is None: #none found in time, fall back to an ordinary layout
+            super().clear_first_click(r, c)
+            return
+
+        layout = MinesweeperEngine(self.rows, self.cols, self.mines, seed, lazy=True)
+        layout.clear_first_click(r, c)
+        flags = [i for i, cell in enumerate(self.cells) if cell & FLAGGED_BIT]
+        self.restore_board(layout.board_snapshot())
+        for i in flags: #flags placed before the first click stay
+            self.cells[i] |= FLAGGED_BIT
+        self.generated = True
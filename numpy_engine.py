@@ -0,0 +1,53 @@
+import numpy as np
+
+from engine import COUNT_MASK, FLAGGED_BIT, MINE_BIT, REVEALED_BIT, MinesweeperEngine, free_cells
+
+
+#Same rules and cell bytes as MinesweeperEngine (needs numpy). self.board is
+#a zero-copy uint8 view of self.cells, so only the whole-board passes are
+#vectorised and everything else is inherited
+class NumpyEngine(MinesweeperEngine):
+    def init_board(self):
+        super().init_board()
+        self.board = np.frombuffer(self.cells, dtype=np.uint8)
+
+    #Vectorised version of engine.sample_mines, drawn with a numpy generator
+    #seeded from self.random so games stay reproducible from the engine seed
+    def place_mines(self, exclude=()):
+        size = self.rows * self.cols
+        free, remap = free_cells(size, [r * self.cols + c for r, c in exclude])
+        if not 0 <= self.mines <= free:
+            raise ValueError(f"cannot place {self.mines} mines in {free} free cells")
+
+        rng = np.random.default_rng(self.random.getrandbits(64))
+        if self.mines * 2 > free:
+            chosen = np.ones(free, dtype=bool)
+            chosen[rng.choice(free, free - self.mines, replace=False)] = False
+            picks = np.flatnonzero(chosen)
+        else:
+            picks = rng.choice(free, self.mines, replace=False)
+
+        for low, high in remap.items():
+            picks[picks == low] = high
+
+        self.board &= FLAGGED_BIT
+        self.board[picks] |= MINE_BIT
+
+    def mine_mask(self):
+        return (self.board & MINE_BIT) != 0
+
+    #3x3 sliding-window sum over a zero-padded mine layer, done as
+    #separable row then column passes (6 slice adds instead of 9)
+    def calculate_numbers(self):
+        mines = self.mine_mask().reshape(self.rows, self.cols)
+        padded = np.zeros((self.rows + 2, self.cols + 2), dtype=np.uint8)
+        padded[1:-1, 1:-1] = mines
+
+        rows_sum = padded[:-2] + padded[1:-1] + padded[2:]
+        counts = rows_sum[:, :-2] + rows_sum[:, 1:-1] + rows_sum[:, 2:] - mines
+
+        self.board &= ~np.uint8(COUNT_MASK)
+        self.board |= counts.reshape(-1)
+
+    def reveal_all_mines(self):
+        self.board[self.mine_mask()] |= REVEALED_BIT
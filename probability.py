@@ -0,0 +1,211 @@
+from math import comb
+
+from engine import iter_bits
+from solver import HIDDEN, UNREVEALED, Cancelled, board_cells, board_constraints, cell_mask, deduce, reduce_constraints
+
+#Exact mine probabilities for every hidden cell, given what the player
+#sees and the total mine count. The certain cells are taken from the solver
+#first; the rest of the frontier is split into components that share no
+#constraint, each component's layouts are counted per number of mines, and
+#the counts are combined with the number of ways to put the remaining
+#mines on the interior (hidden cells next to no number)
+
+
+#Groups constraints whose masks overlap, transitively. Returns a list of
+#(cells mask, constraints dict) per component
+def split_components(constraints):
+    parent = {}
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for mask in constraints:
+        root = None
+        for bit in iter_bits(mask):
+            parent.setdefault(bit, bit)
+            if root is None:
+                root = find(bit)
+            else:
+                parent[find(bit)] = root
+
+    groups = {}
+    for mask, mines in constraints.items():
+        group = groups.setdefault(find(mask.bit_length() - 1), [0, {}])
+        group[0] |= mask
+        group[1][mask] = mines
+    return [(cells, members) for cells, members in groups.values()]
+
+
+#Cell order for the sweep: breadth first from a far end of the component,
+#so constraints open and close close together and few are open at once
+def sweep_order(cells, constraints):
+    touching = {bit: [] for bit in iter_bits(cells)}
+    for mask in constraints:
+        for bit in iter_bits(mask):
+            touching[bit].append(mask)
+
+    def bfs(start):
+        order = [start]
+        seen = {start}
+        for bit in order:
+            for mask in touching[bit]:
+                for other in iter_bits(mask):
+                    if other not in seen:
+                        seen.add(other)
+                        order.append(other)
+        return order
+
+    return bfs(bfs(min(touching))[-1])
+
+
+#Counts the layouts of one component. Cells are assigned in sweep order;
+#the state between two cells is the number of mines each open constraint
+#(started but not finished) still needs, so partial layouts that leave the
+#same needs are merged. A forward pass counts prefixes per state, a
+#backward pass counts completions per state, memoised on (position, state)
+#and only for states the forward pass reached. Returns (ways, per_cell):
+#ways[k] is the number of layouts with k mines, per_cell[bit][k] how many of
+#them have a mine on that cell. `cancelled` is polled once per position
+#of each pass
+def count_layouts(cells, constraints, cancelled=None):
+    order = sweep_order(cells, constraints)
+    n = len(order)
+    position = {bit: p for p, bit in enumerate(order)}
+
+    masks = list(constraints)
+    needs = [constraints[mask] for mask in masks]
+    spans = []
+    touch = [[] for _ in range(n)]
+    left_after = {} #(constraint, position) -> its cells after that position
+    for cid, mask in enumerate(masks):
+        places = sorted(position[bit] for bit in iter_bits(mask))
+        spans.append((places[0], places[-1]))
+        for k, p in enumerate(places):
+            touch[p].append(cid)
+            left_after[cid, p] = len(places) - k - 1
+    open_at = [tuple(cid for cid, (first, last) in enumerate(spans) if first < p <= last) for p in range(n + 1)]
+
+    def step(p, state, mine):
+        current = dict(zip(open_at[p], state))
+        for cid in touch[p]:
+            need = current.get(cid, needs[cid]) - mine
+            if need < 0 or need > left_after[cid, p]:
+                return None
+            current[cid] = need
+        return tuple(current[cid] for cid in open_at[p + 1])
+
+    forward = [{} for _ in range(n + 1)]
+    forward[0][()] = {0: 1}
+    moves = []
+    for p in range(n):
+        if cancelled and cancelled():
+            raise Cancelled
+        layer, nxt = forward[p], forward[p + 1]
+        moved = {}
+        for state, ways in layer.items():
+            for mine in (0, 1):
+                target = step(p, state, mine)
+                moved[state, mine] = target
+                if target is None:
+                    continue
+                counts = nxt.setdefault(target, {})
+                for k, w in ways.items():
+                    counts[k + mine] = counts.get(k + mine, 0) + w
+        moves.append(moved)
+
+    per_cell = {}
+    backward = {(): {0: 1}}
+    for p in range(n - 1, -1, -1):
+        if cancelled and cancelled():
+            raise Cancelled
+        layer = {}
+        mined = {}
+        for state, ways in forward[p].items():
+            counts = {}
+            for mine in (0, 1):
+                rest = backward.get(moves[p][state, mine])
+                if rest is None:
+                    continue
+                for k, w in rest.items():
+                    counts[k + mine] = counts.get(k + mine, 0) + w
+                if mine: #prefix ways * completions through a mine here
+                    for k1, w1 in ways.items():
+                        for k2, w2 in rest.items():
+                            k = k1 + 1 + k2
+                            mined[k] = mined.get(k, 0) + w1 * w2
+            if counts:
+                layer[state] = counts
+        per_cell[order[p]] = mined
+        backward = layer
+
+    return backward.get((), {}), per_cell
+
+
+def convolve(a, b):
+    result = {}
+    for ka, wa in a.items():
+        for kb, wb in b.items():
+            result[ka + kb] = result.get(ka + kb, 0) + wa * wb
+    return result
+
+
+#{(r, c): probability} for every hidden cell. Flagged cells count as mines
+#unless trust_flags=False, in which case they are treated as hidden.
+#Raises ValueError when no layout fits the board (e.g. a wrong flag), and
+#Cancelled once cancelled() returns True
+def mine_probabilities(engine, trust_flags=True, cancelled=None):
+    cells = board_cells(engine)
+    constraints = board_constraints(cells, engine.rows, engine.cols, trust_flags, cancelled)
+    safe, mines = deduce(dict(constraints), cancelled)
+    constraints = reduce_constraints(constraints, safe, mines, cancelled)
+
+    hidden = cell_mask(cells, HIDDEN if trust_flags else UNREVEALED)
+    frontier = 0
+    for mask in constraints:
+        frontier |= mask
+    interior = hidden & ~(frontier | safe | mines)
+    free = interior.bit_count()
+    left = engine.mines - (engine.flags_placed if trust_flags else 0) - mines.bit_count()
+
+    components = [count_layouts(mask, members, cancelled) for mask, members in split_components(constraints)]
+
+    def interior_ways(k): #ways to place the mines the frontier leaves over
+        rest = left - k
+        return comb(free, rest) if 0 <= rest <= free else 0
+
+    total = {0: 1}
+    for ways, _ in components:
+        total = convolve(total, ways)
+    weight = sum(w * interior_ways(k) for k, w in total.items())
+    if not weight:
+        raise ValueError("no mine layout fits the revealed numbers")
+
+    cols = engine.cols
+    probabilities = {}
+    for i in iter_bits(safe):
+        probabilities[divmod(i, cols)] = 0.0
+    for i in iter_bits(mines):
+        probabilities[divmod(i, cols)] = 1.0
+
+    for c, (ways, per_cell) in enumerate(components):
+        if cancelled and cancelled():
+            raise Cancelled
+        others = {0: 1}
+        for d, (other, _) in enumerate(components):
+            if d != c:
+                others = convolve(others, other)
+        #weight of the rest of the board when this component holds k mines
+        outside = {k: sum(w * interior_ways(k + ko) for ko, w in others.items()) for k in ways}
+        for bit, mined in per_cell.items():
+            probabilities[divmod(bit, cols)] = sum(w * outside[k] for k, w in mined.items()) / weight
+
+    if free:
+        interior_mines = sum(w * (comb(free - 1, left - k - 1) if 0 < left - k <= free else 0)
+                             for k, w in total.items())
+        share = interior_mines / weight
+        for i in iter_bits(interior):
+            probabilities[divmod(i, cols)] = share
+    return probabilities
@@ -0,0 +1,138 @@
+import pygame
+from pygame._sdl2.video import Renderer, Texture, Window
+
+from colors import DARK_GRAY
+from main import CELL_SIZE, TOP_BAR_HEIGHT, MinesweeperGame
+from tiles import TILE_COUNT, build_tiles, tile_at
+
+BACKGROUND = pygame.Color(DARK_GRAY) #draw_color wants RGBA
+
+
+#Same game drawn through an SDL2 Renderer instead of the display surface.
+#The tile atlas is uploaded once as a single texture and every cell is a
+#copy of one region of it; the renderer scales regions for zoom levels, so
+#no per-zoom tile sets are needed. The board layer is a target texture that
+#only gets the changed cells, the menu and status bar are streaming textures.
+#software=True asks for SDL's software renderer (no GPU, e.g. kiosks or CI)
+class SDL2MinesweeperGame(MinesweeperGame):
+    def __init__(self, custom=None, no_guess=False, software=False):
+        self.software = software
+        self.window = None
+        super().__init__(custom, no_guess)
+
+    def open_window(self, size):
+        if self.window is None:
+            self.window = Window("Minesweeper", size)
+            self.renderer = Renderer(self.window, accelerated=0 if self.software else -1, target_texture=True)
+        else:
+            self.window.size = size
+        #the menu is still drawn with pygame.draw/font, then uploaded
+        self.screen = pygame.Surface(size)
+        self.screen_texture = Texture(self.renderer, size, streaming=True)
+
+    def load_tiles(self):
+        tiles = build_tiles(CELL_SIZE, self.font, convert=False)
+        strip = pygame.Surface((CELL_SIZE * TILE_COUNT, CELL_SIZE))
+        for tile, surface in enumerate(tiles):
+            strip.blit(surface, (tile * CELL_SIZE, 0))
+        self.atlas = Texture.from_surface(self.renderer, strip)
+        return tiles
+
+    def init_layers(self, view_width, view_height):
+        self.board_surface = pygame.Surface((view_width, view_height)) #compositor output
+        self.status_surface = pygame.Surface((self.width, TOP_BAR_HEIGHT))
+        self.board_texture = Texture(self.renderer, (view_width, view_height), target=True)
+        self.status_texture = Texture(self.renderer, (self.width, TOP_BAR_HEIGHT), streaming=True)
+        self.composite_texture = Texture(self.renderer, (view_width, view_height), streaming=True)
+
+    #The back buffer is undefined after a present, so every frame copies
+    #the whole layers again; returns whether anything changed
+    def draw(self):
+        renderer = self.renderer
+        if self.state == "MENU":
+            if not self.full_redraw:
+                return False
+            self.full_redraw = False
+            self.draw_menu()
+            self.screen_texture.update(self.screen)
+            renderer.draw_color = BACKGROUND
+            renderer.clear()
+            self.screen_texture.draw()
+            return True
+
+        changed = False
+        if self.status_changed():
+            self.draw_status_bar()
+            self.status_texture.update(self.status_surface)
+            changed = True
+
+        if self.full_redraw or self.dirty_cells:
+            renderer.target = self.board_texture
+            self.draw_board()
+            renderer.target = None
+            changed = True
+
+        self.dirty_cells.clear()
+        self.full_redraw = False
+        if changed or self.show_stats:
+            renderer.draw_color = BACKGROUND
+            renderer.clear()
+            self.status_texture.draw(dstrect=(0, 0))
+            self.board_texture.draw(dstrect=(0, TOP_BAR_HEIGHT))
+            self.draw_hint()
+            if self.show_stats:
+                Texture.from_surface(renderer, self.render_stats()).draw(dstrect=(0, TOP_BAR_HEIGHT))
+            return True
+        return False
+
+    #drawn over the composed frame, so the board texture never holds it
+    def draw_hint(self):
+        outline = self.hint_outline()
+        if outline:
+            rect, color = outline
+            self.renderer.set_viewport(self.board_surface.get_rect(top=TOP_BAR_HEIGHT)) #clips to the board
+            self.renderer.draw_color = pygame.Color(color)
+            for _ in range(max(1, rect.width // 10)): #draw_rect is one pixel wide
+                self.renderer.draw_rect(rect)
+                rect.inflate_ip(-2, -2)
+            self.renderer.set_viewport(None)
+
+    #runs with the board texture as render target
+    def draw_board(self):
+        r0, r1, c0, c1 = self.camera.visible_cells()
+        if self.needs_full_repaint(r0, r1, c0, c1):
+            if self.use_compositor():
+                self.compositor.render(self.board_surface, self.engine, self.camera, self.tiles, DARK_GRAY)
+                self.composite_texture.update(self.board_surface)
+                self.composite_texture.draw()
+            else:
+                self.renderer.draw_color = BACKGROUND
+                self.renderer.clear() #shows around boards smaller than the view
+                for r in range(r0, r1):
+                    for c in range(c0, c1):
+                        self.draw_cell(r, c)
+            return
+
+        for r, c in self.dirty_cells:
+            if r0 <= r < r1 and c0 <= c < c1:
+                self.draw_cell(r, c)
+
+    def draw_cell(self, r, c):
+        tile = tile_at(self.engine, r, c)
+        x, y = self.camera.cell_origin(r, c)
+        size = self.camera.cell_size
+        self.atlas.draw(srcrect=(tile * CELL_SIZE, 0, CELL_SIZE, CELL_SIZE), dstrect=(x, y, size, size))
+
+    def handle_event(self, event):
+        if event.type == pygame.RENDER_TARGETS_RESET:
+            self.full_redraw = True #target textures lost their contents
+        elif event.type == pygame.RENDER_DEVICE_RESET: #every texture is gone
+            self.tile_sets[CELL_SIZE] = self.load_tiles()
+            self.screen_texture = Texture(self.renderer, self.screen.get_size(), streaming=True)
+            if self.state != "MENU":
+                self.init_layers(self.camera.view_width, self.camera.view_height)
+            self.full_redraw = True
+        super().handle_event(event)
+
+    def present(self, rects):
+        self.renderer.present()
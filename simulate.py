@@ -0,0 +1,136 @@
+import argparse
+import csv
+import math
+import os
+import random
+import time
+from multiprocessing import Pool
+
+from engine import BACKENDS, DIFFICULTIES, create_engine, iter_bits
+from no_guess import NoGuessEngine
+from probability import mine_probabilities
+from solver import HIDDEN, board_cells, cell_mask, solve
+
+#random: click any hidden cell. solver: certain moves, a random cell when
+#stuck. probability: certain moves, the least likely mine when stuck
+STRATEGIES = ("random", "solver", "probability")
+
+FIELDS = ("level", "seed", "strategy", "win", "clicks", "guesses", "seconds")
+
+
+def random_guess(engine, rng):
+    hidden = list(iter_bits(cell_mask(board_cells(engine), HIDDEN)))
+    return divmod(rng.choice(hidden), engine.cols)
+
+
+def safest_guess(engine, rng):
+    chances = mine_probabilities(engine)
+    lowest = min(chances.values())
+    return rng.choice([cell for cell, chance in chances.items() if chance == lowest])
+
+
+#Plays one game from a first click in the middle. Returns (clicks, guesses);
+#the first click is safe, so it is not a guess
+def play(engine, strategy, rng):
+    engine.reveal(engine.rows // 2, engine.cols // 2)
+    clicks = 1
+    guesses = 0
+    while not engine.finished:
+        if strategy != "random":
+            safe, mines = solve(engine)
+            for r, c in mines:
+                if not engine.is_flagged(r, c):
+                    engine.toggle_flag(r, c)
+            if safe:
+                for r, c in safe:
+                    clicks += bool(engine.reveal(r, c)) #earlier fills may have opened it
+                continue
+
+        guess = safest_guess if strategy == "probability" else random_guess
+        engine.reveal(*guess(engine, rng))
+        clicks += 1
+        guesses += 1
+    return clicks, guesses
+
+
+#Worker task: plays the given seeds of one level, returns one row per game.
+#Game `seed` is always the same board and the same guesses
+def run_games(task):
+    level, strategy, seeds, backend, no_guess = task
+    rows, cols, mines = DIFFICULTIES[level]
+    results = []
+    for seed in seeds:
+        start = time.perf_counter()
+        if no_guess:
+            #already one game per core, and no time limit so a seed is always the same board
+            engine = NoGuessEngine(rows, cols, mines, seed, workers=1, seconds=None)
+        else:
+            engine = create_engine(rows, cols, mines, seed, backend, lazy=True)
+        clicks, guesses = play(engine, strategy, random.Random(f"{level}:{seed}"))
+        results.append((level, seed, strategy, int(engine.win), clicks, guesses,
+                        round(time.perf_counter() - start, 6)))
+    return results
+
+
+#95% Wilson score interval for a win rate, clamped to [0, 1] against
+#rounding at 0% and 100%
+def wilson(wins, games, z=1.96):
+    if not games:
+        return 0.0, 0.0
+    p = wins / games
+    centre = p + z * z / (2 * games)
+    margin = z * math.sqrt(p * (1 - p) / games + z * z / (4 * games * games))
+    scale = 1 + z * z / games
+    return max(0.0, (centre - margin) / scale), min(1.0, (centre + margin) / scale)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play many headless games across all cores")
+    parser.add_argument("--games", type=int, default=1000, help="games per level")
+    parser.add_argument("--levels", type=int, nargs="+", default=sorted(DIFFICULTIES), choices=sorted(DIFFICULTIES))
+    parser.add_argument("--strategy", choices=STRATEGIES, default="probability")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="python")
+    parser.add_argument("--no-guess", action="store_true", help="deal no-guess boards (no_guess.py, python backend only)")
+    parser.add_argument("--seed", type=int, default=0, help="first game seed")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk", type=int, default=100, help="games per worker task")
+    parser.add_argument("--out", default="results.csv", help="per-game CSV, written as games finish")
+    args = parser.parse_args()
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+    if args.no_guess and args.backend != "python":
+        parser.error("--no-guess boards are dealt by the python engine, it cannot be combined with --backend")
+    if args.chunk < 1:
+        parser.error("--chunk must be at least 1")
+
+    tasks = [(level, args.strategy, range(start, min(start + args.chunk, args.seed + args.games)),
+              args.backend, args.no_guess)
+             for level in args.levels
+             for start in range(args.seed, args.seed + args.games, args.chunk)]
+
+    totals = {level: [0, 0, 0, 0.0] for level in args.levels} #games, wins, guesses, seconds
+    start = time.perf_counter()
+    with open(args.out, "w", newline="") as out, Pool(args.workers) as pool:
+        writer = csv.writer(out)
+        writer.writerow(FIELDS)
+        for results in pool.imap_unordered(run_games, tasks):
+            writer.writerows(results)
+            out.flush()
+            for level, _, _, win, _, guesses, seconds in results:
+                total = totals[level]
+                total[0] += 1
+                total[1] += win
+                total[2] += guesses
+                total[3] += seconds
+    elapsed = time.perf_counter() - start
+
+    print(f"{'level':<7}{'board':>11}{'games':>9}{'win rate':>10}{'95% CI':>17}{'guesses':>9}{'ms/game':>9}")
+    for level, (games, wins, guesses, seconds) in totals.items():
+        if not games:
+            continue
+        rows, cols, mines = DIFFICULTIES[level]
+        low, high = wilson(wins, games)
+        print(f"{level:<7}{f'{rows}x{cols}/{mines}':>11}{games:>9}{wins / games:>10.1%}"
+              f"{f'{low:.1%} - {high:.1%}':>17}{guesses / games:>9.2f}{seconds / games * 1000:>9.2f}")
+    played = sum(total[0] for total in totals.values())
+    print(f"{played} games in {elapsed:.1f} s ({played / elapsed:.0f} games/s on {args.workers} workers), results in {args.out}")
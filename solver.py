@@ -0,0 +1,227 @@
+from functools import lru_cache
+
+from engine import COUNT_MASK, FLAGGED_BIT, MINE_BIT, REVEALED_BIT, iter_bits, neighbor_lookup
+
+#Constraint propagation over what a player can see: revealed numbers and
+#flags. A constraint is a set of hidden cells holding an exact number of
+#mines, kept in a dict {mask: mines} where bit i of mask is flat cell i.
+#No pygame and no peeking at hidden cells, so it runs headless in batches
+
+
+#Raised from inside a search when its `cancelled()` callback returns True,
+#so a caller that no longer wants the answer gets control back early
+class Cancelled(Exception):
+    pass
+
+
+#bytes.translate tables from a cell byte to b"1" or b"0", so a whole board
+#turns into one bit mask at C speed (see cell_mask)
+def digit_table(test):
+    return bytes(ord("1") if test(b) else ord("0") for b in range(256))
+
+
+HIDDEN = digit_table(lambda b: not b & (REVEALED_BIT | FLAGGED_BIT))
+UNREVEALED = digit_table(lambda b: not b & REVEALED_BIT)
+FLAGGED = digit_table(lambda b: b & FLAGGED_BIT and not b & REVEALED_BIT)
+NUMBERED = digit_table(lambda b: b & REVEALED_BIT and b & COUNT_MASK and not b & MINE_BIT)
+
+
+def cell_mask(cells, table):
+    return int(cells.translate(table)[::-1], 2)
+
+
+#Boards up to this many cells get cached neighbor masks. Mask i is about
+#i/8 bytes, so the table grows with the square of the board
+MASK_MAX_CELLS = 1 << 12
+
+
+#neighbor_table as bit masks: bit j of masks[i] is set for each neighbor j of i
+@lru_cache(maxsize=8)
+def neighbor_masks(rows, cols):
+    around = neighbor_lookup(rows, cols)
+    return [sum(1 << j for j in around(i)) for i in range(rows * cols)]
+
+
+#(whole board, all but the first column, all but the last column)
+@lru_cache(maxsize=8)
+def edge_masks(rows, cols):
+    full = (1 << rows * cols) - 1
+    first_column = sum(1 << r * cols for r in range(rows))
+    return full, full & ~first_column, full & ~(first_column << cols - 1)
+
+
+#Every cell in or next to x, with whole-board shifts. Horizontal shifts
+#drop the bits that would wrap into the neighbouring row
+def dilate(x, rows, cols):
+    full, not_first, not_last = edge_masks(rows, cols)
+    row = x | (x << 1 & not_first) | (x >> 1 & not_last)
+    return (row | row << cols | row >> cols) & full
+
+
+#The engine cell bytes, rebuilt from the accessors for backends that store
+#the board some other way
+def board_cells(engine):
+    if hasattr(engine, "cells"):
+        return engine.cells
+    cells = bytearray(engine.rows * engine.cols)
+    for r in range(engine.rows):
+        for c in range(engine.cols):
+            cell = 0
+            if engine.is_revealed(r, c):
+                value = engine.value(r, c)
+                cell = REVEALED_BIT | (MINE_BIT if value < 0 else value)
+            elif engine.is_flagged(r, c):
+                cell = FLAGGED_BIT
+            cells[r * engine.cols + c] = cell
+    return cells
+
+
+#One constraint per revealed number that still touches hidden cells.
+#trust_flags=False treats flagged cells as hidden instead of as mines.
+#`cancelled` is polled once per number, on big boards each one is a
+#whole-board mask operation
+def board_constraints(cells, rows, cols, trust_flags=True, cancelled=None):
+    if rows * cols <= MASK_MAX_CELLS:
+        masks = neighbor_masks(rows, cols)
+    else:
+        around = neighbor_lookup(rows, cols)
+        masks = None
+
+    hidden = cell_mask(cells, HIDDEN if trust_flags else UNREVEALED)
+    flagged = cell_mask(cells, FLAGGED) if trust_flags else 0
+    frontier = cell_mask(cells, NUMBERED) & dilate(hidden, rows, cols) #numbers next to a hidden cell
+    constraints = {}
+    for i in iter_bits(frontier):
+        if cancelled and cancelled():
+            raise Cancelled
+        ring = masks[i] if masks else sum(1 << j for j in around(i))
+        constraints[ring & hidden] = (cells[i] & COUNT_MASK) - (ring & flagged).bit_count()
+    return constraints
+
+
+#Drops cells already known to be safe or mines from every constraint
+def reduce_constraints(constraints, safe, mines, cancelled=None):
+    known = safe | mines
+    reduced = {}
+    for mask, count in constraints.items():
+        if cancelled and cancelled():
+            raise Cancelled
+        if mask & known:
+            count -= (mask & mines).bit_count()
+            mask &= ~known
+        if mask:
+            reduced[mask] = count
+    return reduced
+
+
+#Single-cell rule: a constraint with no mines left is all safe, one with as
+#many mines as cells is all mines
+def single_cell_rule(constraints, cancelled=None):
+    safe = mines = 0
+    for mask, count in constraints.items():
+        if cancelled and cancelled():
+            raise Cancelled
+        if count == 0:
+            safe |= mask
+        elif count == mask.bit_count():
+            mines |= mask
+    return safe, mines
+
+
+#Rules between two overlapping constraints a and b. Subset: a inside b
+#leaves b - a with the difference in mines, a new constraint. Superset:
+#when b's extra mines over a fill every cell of b - a, those are mines and
+#a - b is safe. Only constraints sharing a cell are ever paired, each pair
+#once: in the group of the lowest cell they share
+def pair_rules(constraints):
+    by_cell = {} #lowest set bit of a one-cell mask -> constraints on that cell
+    for mask in constraints:
+        rest = mask
+        while rest:
+            cell = rest & -rest
+            by_cell.setdefault(cell, []).append(mask)
+            rest ^= cell
+
+    safe = mines = 0
+    derived = {}
+    for cell, group in by_cell.items():
+        for k, a in enumerate(group):
+            count_a = constraints[a]
+            for b in group[k + 1:]:
+                shared = a & b
+                if shared & -shared != cell:
+                    continue
+                only_a, only_b = a ^ shared, b ^ shared
+                more = constraints[b] - count_a #mines b has beyond a
+                if not only_a or not only_b: #subset
+                    extra, more = (only_b, more) if only_b else (only_a, -more)
+                    if more == 0:
+                        safe |= extra
+                    elif more == extra.bit_count():
+                        mines |= extra
+                    elif extra not in constraints:
+                        derived[extra] = more
+                elif more == only_b.bit_count(): #superset
+                    mines |= only_b
+                    safe |= only_a
+                elif -more == only_a.bit_count():
+                    mines |= only_a
+                    safe |= only_b
+    return safe, mines, derived
+
+
+#Runs the rules until nothing new follows, polling `cancelled` once per
+#round and per constraint in the whole-board passes. Returns (safe, mines) masks
+def deduce(constraints, cancelled=None):
+    safe = mines = 0
+    while constraints:
+        if cancelled and cancelled():
+            raise Cancelled
+        found_safe, found_mines = single_cell_rule(constraints, cancelled)
+        if not (found_safe or found_mines):
+            found_safe, found_mines, derived = pair_rules(constraints)
+            if not (found_safe or found_mines):
+                if not derived:
+                    break
+                constraints.update(derived)
+                continue
+        safe |= found_safe
+        mines |= found_mines
+        constraints = reduce_constraints(constraints, safe, mines, cancelled)
+    return safe, mines
+
+
+#Cells that are certainly safe and certainly mines on the board as the
+#player sees it, as two lists of (r, c). Raises Cancelled once
+#cancelled() returns True
+def solve(engine, trust_flags=True, cancelled=None):
+    cells = board_cells(engine)
+    constraints = board_constraints(cells, engine.rows, engine.cols, trust_flags, cancelled)
+    safe, mines = deduce(constraints, cancelled)
+
+    #global count: once every mine is accounted for the rest is safe, and
+    #when the hidden cells are exactly the mines left they are all mines
+    hidden = cell_mask(cells, HIDDEN if trust_flags else UNREVEALED) & ~(safe | mines)
+    left = engine.mines - (engine.flags_placed if trust_flags else 0) - mines.bit_count()
+    if hidden and left == 0:
+        safe |= hidden
+    elif hidden and left == hidden.bit_count():
+        mines |= hidden
+
+    cols = engine.cols
+    return [divmod(i, cols) for i in iter_bits(safe)], [divmod(i, cols) for i in iter_bits(mines)]
+
+
+#Plays certain moves only (flagging every deduced mine) until the game is
+#won or a guess would be needed. Returns True on a win
+def play_safe(engine):
+    while not engine.finished:
+        safe, mines = solve(engine)
+        if not safe and not mines:
+            return False
+        for r, c in mines:
+            if not engine.is_flagged(r, c):
+                engine.toggle_flag(r, c)
+        for r, c in safe:
+            engine.reveal(r, c)
+    return engine.win
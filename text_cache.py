@@ -0,0 +1,22 @@
+from collections import OrderedDict
+
+
+#Bounded LRU of rendered text surfaces keyed by (font, text, color), so
+#labels that rarely change are not re-rendered with font.render every frame
+class TextCache:
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.surfaces = OrderedDict()
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False) #least recently used
+        return surface
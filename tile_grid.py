@@ -0,0 +1,54 @@
+from tiles import TILE_OF_CELL, tile_at
+
+
+#The visible part of the board as one blit sequence of (tile, dest) pairs,
+#row-major over the visible cells, submitted with a single Surface.fblits
+#(pygame-ce) or Surface.blits call. The sequence is kept between frames:
+#destinations are recomputed only when the view moves or zooms, tile ids
+#are read a row at a time with bytes.translate, and changed cells just
+#replace their own entry
+class TileGrid:
+    def __init__(self):
+        self.view = None #(x, y, cell_size, visible cells, tiles) the entries were built for
+        self.bounds = (0, 0, 0, 0)
+        self.dests = []
+        self.entries = []
+
+    def view_of(self, camera, tiles):
+        return camera.x, camera.y, camera.cell_size, camera.visible_cells(), id(tiles)
+
+    def matches(self, camera, tiles):
+        return self.view == self.view_of(camera, tiles)
+
+    def build(self, engine, camera, tiles):
+        view = self.view_of(camera, tiles)
+        if view != self.view:
+            r0, r1, c0, c1 = self.bounds = camera.visible_cells()
+            self.dests = [camera.cell_origin(r, c) for r in range(r0, r1) for c in range(c0, c1)]
+            self.view = view
+
+        r0, r1, c0, c1 = self.bounds
+        cols, cells = engine.cols, engine.cells
+        ids = b"".join(cells[r * cols + c0:r * cols + c1] for r in range(r0, r1)).translate(TILE_OF_CELL)
+        self.entries = list(zip([tiles[tile] for tile in ids], self.dests))
+        if engine.exploded is not None:
+            self.patch(engine, tiles, [engine.exploded])
+
+    #Refreshes the entries of the given cells, returns the ones in view
+    def patch(self, engine, tiles, cells):
+        r0, r1, c0, c1 = self.bounds
+        width = c1 - c0
+        changed = []
+        for r, c in cells:
+            if r0 <= r < r1 and c0 <= c < c1: #culled when off-screen
+                k = (r - r0) * width + c - c0
+                self.entries[k] = entry = (tiles[tile_at(engine, r, c)], self.dests[k])
+                changed.append(entry)
+        return changed
+
+    def blit(self, surface):
+        fblits = getattr(surface, "fblits", None)
+        if fblits:
+            fblits(self.entries)
+        else:
+            surface.blits(self.entries, False)
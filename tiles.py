@@ -0,0 +1,83 @@
+import pygame
+
+from colors import BLACK, DARK_GRAY, GRAY, NUMBER_COLORS, RED, WHITE
+from engine import COUNT_MASK, FLAGGED_BIT, MINE_BIT, REVEALED_BIT
+
+#Tile ids: 0-8 are revealed numbers, then the other cell states
+TILE_MINE = 9
+TILE_EXPLODED = 10 #the mine that ended the game
+TILE_HIDDEN = 11
+TILE_FLAGGED = 12
+TILE_COUNT = 13
+
+
+def tile_of_cell(cell):
+    if not cell & REVEALED_BIT:
+        return TILE_FLAGGED if cell & FLAGGED_BIT else TILE_HIDDEN
+    if cell & MINE_BIT:
+        return TILE_MINE
+    return cell & COUNT_MASK
+
+
+#engine cell byte -> tile id, usable with bytes.translate over a whole row
+TILE_OF_CELL = bytes(tile_of_cell(cell) for cell in range(256))
+
+
+def tile_at(engine, r, c):
+    if (r, c) == engine.exploded:
+        return TILE_EXPLODED
+    return TILE_OF_CELL[engine.cells[r * engine.cols + c]] #engine cells are flat, row-major
+
+
+def draw_hidden(surface, rect):
+    #kotak tertutup
+    pygame.draw.rect(surface, GRAY, rect)
+
+    #3D BORDERS
+    pygame.draw.line(surface, WHITE, (rect.left, rect.bottom), (rect.left, rect.top))
+    pygame.draw.line(surface, WHITE, (rect.right, rect.top), (rect.left, rect.top))
+    pygame.draw.line(surface, DARK_GRAY, (rect.right - 1, rect.top), (rect.right - 1, rect.bottom))
+    pygame.draw.line(surface, DARK_GRAY, (rect.left, rect.bottom - 1), (rect.right, rect.bottom - 1))
+
+
+def draw_revealed(surface, rect, background=GRAY):
+    pygame.draw.rect(surface, background, rect)
+    pygame.draw.rect(surface, BLACK, rect, 1) #bordernya
+
+
+#One Surface per tile id, each cell_size square. convert=True turns them into
+#the display format, which needs a display mode
+def build_tiles(cell_size, font, convert=True):
+    tiles = []
+    rect = pygame.Rect(0, 0, cell_size, cell_size)
+    for tile in range(TILE_COUNT):
+        surface = pygame.Surface(rect.size)
+
+        if tile == TILE_HIDDEN or tile == TILE_FLAGGED:
+            draw_hidden(surface, rect)
+            if tile == TILE_FLAGGED: #flag (segitiga merah)
+                p1 = (rect.centerx - 5, rect.centery - 5)
+                p2 = (rect.centerx + 5, rect.centery)
+                p3 = (rect.centerx - 5, rect.centery + 5)
+                pygame.draw.polygon(surface, RED, [p1, p2, p3])
+
+        elif tile == TILE_MINE or tile == TILE_EXPLODED: #bom (black dots)
+            draw_revealed(surface, rect, RED if tile == TILE_EXPLODED else GRAY)
+            pygame.draw.circle(surface, BLACK, rect.center, cell_size // 4)
+
+        else:
+            draw_revealed(surface, rect)
+            if tile > 0: #angka
+                text = font.render(str(tile), True, NUMBER_COLORS.get(tile, BLACK))
+                surface.blit(text, text.get_rect(center=rect.center))
+
+        tiles.append(surface.convert() if convert else surface)
+    return tiles
+
+
+#The atlas at another cell size, scaled from a full-size one
+def scale_tiles(tiles, cell_size):
+    size = (cell_size, cell_size)
+    if tiles[0].get_bitsize() >= 24:
+        return [pygame.transform.smoothscale(tile, size) for tile in tiles]
+    return [pygame.transform.scale(tile, size) for tile in tiles]